@@ -0,0 +1,167 @@
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+from .config import ProcessingConfig
+from .exceptions import CheckpointMismatchError
+from .io import json_default
+from .rules_engine import GeneRules
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FORMAT = "paraphrase-checkpoint"
+CHECKPOINT_VERSION = 1
+
+
+def _rules_source(rules: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if rules is None:
+        return None
+    return {
+        gene: {
+            "default_status": gene_rules.default_status,
+            "status_order": list(gene_rules.status_order),
+            "rules": list(gene_rules.source),
+        }
+        if isinstance(gene_rules, GeneRules)
+        else gene_rules
+        for gene, gene_rules in rules.items()
+    }
+
+
+def config_fingerprint(config: ProcessingConfig) -> str:
+    """
+    Hash of every setting that changes a sample's processed result, so a
+    checkpoint is only resumed by a run that would produce the same results.
+    """
+    settings = {
+        "skip_keys": sorted(config.skip_keys),
+        "genes_list": sorted(g.lower() for g in config.genes_list)
+        if config.genes_list
+        else None,
+        "rules": _rules_source(config.rules),
+        "cohort": config.cohort.to_dict() if config.cohort is not None else None,
+        "projection": {
+            gene: sorted(fields) if fields is not None else None
+            for gene, fields in config.projection.items()
+        }
+        if config.projection is not None
+        else None,
+    }
+    encoded = json.dumps(settings, sort_keys=True, default=json_default)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _dumps_line(entry: Dict[str, Any]) -> str:
+    return json.dumps(entry, default=json_default) + "\n"
+
+
+def _entry_line(sample: str, file: str, result: dict) -> str:
+    return _dumps_line({"sample": sample, "file": file, "result": result})
+
+
+@dataclass(frozen=True)
+class CheckpointEntry:
+    file: str
+    result: dict
+
+
+class Checkpoint:
+    """
+    Append-only record of completed samples and their processed results.
+
+    The first line is a header with a fingerprint of the processing settings
+    (see config_fingerprint); each following line is a JSON object
+    {"sample": ..., "file": ..., "result": ...} that is flushed and synced to
+    disk as soon as the sample is done, so a crashed or preempted run can be
+    resumed without redoing finished samples. A truncated last line (e.g. from
+    a kill mid-write) is ignored on load.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+
+    def load(self, fingerprint: str) -> Dict[str, CheckpointEntry]:
+        """
+        Return {sample: entry} for every completed sample.
+
+        Raises CheckpointMismatchError if the checkpoint was written with other
+        processing settings (or has no header).
+        """
+        completed: Dict[str, CheckpointEntry] = {}
+        if not self.path.exists():
+            return completed
+        with self.path.open("r", encoding="utf-8") as f:
+            try:
+                header = json.loads(f.readline() or "{}")
+            except json.JSONDecodeError:
+                header = {}
+            if (
+                not isinstance(header, dict)
+                or header.get("format") != CHECKPOINT_FORMAT
+                or header.get("fingerprint") != fingerprint
+            ):
+                raise CheckpointMismatchError(
+                    f"Checkpoint {self.path} was written with different settings "
+                    "(rules, genes, skip keys or cohort statistics); "
+                    "rerun without --resume or use a new checkpoint file"
+                )
+            for line_number, line in enumerate(f, start=2):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    completed[entry["sample"]] = CheckpointEntry(
+                        entry["file"], entry["result"]
+                    )
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    logger.warning(
+                        f"Ignoring unreadable checkpoint line {line_number} in {self.path}"
+                    )
+        return completed
+
+    def open(
+        self,
+        fingerprint: str,
+        completed: Optional[Dict[str, CheckpointEntry]] = None,
+    ) -> None:
+        """
+        Start the checkpoint with a header and the `completed` entries (as
+        returned by load when resuming), then open it for appending. Any
+        previous checkpoint is replaced.
+
+        The new content is written to a temporary file, synced once and moved
+        over the checkpoint, so the previous checkpoint stays intact until the
+        new one is complete. Only readable entries are carried over, so a
+        partial last line is dropped.
+        """
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            f.write(
+                _dumps_line(
+                    {
+                        "format": CHECKPOINT_FORMAT,
+                        "version": CHECKPOINT_VERSION,
+                        "fingerprint": fingerprint,
+                    }
+                )
+            )
+            for sample, entry in (completed or {}).items():
+                f.write(_entry_line(sample, entry.file, entry.result))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._file = self.path.open("a", encoding="utf-8")
+
+    def record(self, sample: str, file: str, result: dict) -> None:
+        self._file.write(_entry_line(sample, file, result))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,171 @@
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from .rules_engine import FieldPath
+from .summary import QuantileSketch
+
+COHORT_STATS_FORMAT = "paraphrase-cohort-stats"
+COHORT_STATS_VERSION = 1
+
+
+class MetricStatistics:
+    """
+    Running statistics for one gene metric across a cohort.
+
+    Mean and variance are kept with Welford's algorithm and the distribution
+    with a mergeable quantile sketch, so memory does not grow with the cohort.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sketch = QuantileSketch()
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.sketch.add(value)
+
+    def merge(self, other: "MetricStatistics") -> None:
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta**2 * self.count * other.count / count
+        self.count = count
+        self.sketch.merge(other.sketch)
+
+    @property
+    def std(self) -> Optional[float]:
+        """Sample standard deviation, or None with fewer than two values."""
+        if self.count < 2:
+            return None
+        return math.sqrt(self.m2 / (self.count - 1))
+
+    def zscore(self, value: float) -> Optional[float]:
+        std = self.std
+        if not std:
+            return None
+        return (value - self.mean) / std
+
+    def percentile(self, value: float) -> Optional[float]:
+        """Approximate percentile (0-100) of value within the cohort."""
+        rank = self.sketch.rank(value)
+        return None if rank is None else 100.0 * rank
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "std": self.std,
+            "sketch": self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MetricStatistics":
+        statistics = cls()
+        statistics.count = data["count"]
+        statistics.mean = data["mean"]
+        statistics.m2 = data["m2"]
+        statistics.sketch = QuantileSketch.from_dict(data["sketch"])
+        return statistics
+
+
+def _numeric_values(value: Any) -> Iterable[float]:
+    if isinstance(value, bool):
+        return
+    if isinstance(value, (int, float)):
+        yield float(value)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _numeric_values(item)
+
+
+class CohortStatistics:
+    """
+    Per-(gene, metric) statistics used by cohort-relative rule operators.
+
+    Gene names are stored lower-cased, matching the case-insensitive rule
+    lookup. Statistics are computed once per metric and shared by every rule
+    evaluation; they can be saved and reused for later single-sample runs.
+    """
+
+    def __init__(self):
+        self.samples = 0
+        self.metrics: Dict[Tuple[str, str], MetricStatistics] = {}
+
+    def get(self, gene: str, metric: str) -> Optional[MetricStatistics]:
+        return self.metrics.get((gene.lower(), metric))
+
+    def _add_value(self, gene: str, metric: str, value: Any) -> None:
+        for number in _numeric_values(value):
+            statistics = self.metrics.get((gene, metric))
+            if statistics is None:
+                statistics = self.metrics[(gene, metric)] = MetricStatistics()
+            statistics.add(number)
+
+    def add_sample(
+        self,
+        processed: Dict[str, Dict[str, Any]],
+        metrics: Optional[Set[Tuple[str, str]]] = None,
+    ) -> None:
+        """
+        Add one processed sample. With `metrics` ({(gene, path)}), only those
+        are collected; otherwise every numeric top-level metric is.
+        """
+        self.samples += 1
+        if metrics is None:
+            for gene, gene_info in processed.items():
+                for metric, value in gene_info.items():
+                    self._add_value(gene.lower(), metric, value)
+            return
+
+        genes = {gene.lower(): gene_info for gene, gene_info in processed.items()}
+        for gene, path in metrics:
+            gene_info = genes.get(gene)
+            if gene_info is not None:
+                value = FieldPath.parse(path).resolve(gene_info)
+                self._add_value(gene, path, value)
+
+    def merge(self, other: "CohortStatistics") -> None:
+        self.samples += other.samples
+        for key, statistics in other.metrics.items():
+            if key not in self.metrics:
+                self.metrics[key] = MetricStatistics()
+            self.metrics[key].merge(statistics)
+
+    def to_dict(self) -> Dict[str, Any]:
+        genes: Dict[str, Dict[str, Any]] = {}
+        for (gene, metric), statistics in sorted(self.metrics.items()):
+            genes.setdefault(gene, {})[metric] = statistics.to_dict()
+        return {
+            "format": COHORT_STATS_FORMAT,
+            "version": COHORT_STATS_VERSION,
+            "samples": self.samples,
+            "genes": genes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CohortStatistics":
+        if data.get("format") != COHORT_STATS_FORMAT:
+            raise ValueError("Not a paraphrase cohort statistics file")
+        cohort = cls()
+        cohort.samples = data["samples"]
+        for gene, metrics in data["genes"].items():
+            for metric, statistics in metrics.items():
+                cohort.metrics[(gene.lower(), metric)] = MetricStatistics.from_dict(
+                    statistics
+                )
+        return cohort
+
+    @classmethod
+    def load(cls, file: Path) -> "CohortStatistics":
+        with file.open("r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from typing import List, Optional, Set, Dict, Any
+from typing import List, Optional, Set, Dict, Any, FrozenSet
+from .rules_engine import GeneRules, compile_rules
 
 
 @dataclass
@@ -9,9 +10,24 @@ class ProcessingConfig:
 
     - skip_keys: keys under each gene that should be ignored entirely.
     - genes_list: optional list of genes to keep; if None, keep all.
-    - rules: optional per-gene classification rules YAML structure.
+    - rules: optional per-gene classification rules YAML structure; raw YAML
+      is compiled once here (see compile_rules), which also fixes the
+      dependency order for cross-gene rules.
+    - cohort: optional CohortStatistics for cohort-relative rule operators.
+    - profiler: optional RuleProfiler collecting per-rule evaluation statistics.
+    - projection: optional {gene: fields} to keep (see rules_projection); other
+      genes and fields are dropped when loading and processing.
     """
 
     skip_keys: Set[str]
     genes_list: Optional[List[str]] = None
     rules: Optional[Dict[str, Any]] = None
+    cohort: Optional[Any] = None
+    profiler: Optional[Any] = None
+    projection: Optional[Dict[str, Optional[FrozenSet[str]]]] = None
+
+    def __post_init__(self):
+        if self.rules and not all(
+            isinstance(gene_rules, GeneRules) for gene_rules in self.rules.values()
+        ):
+            self.rules = compile_rules(self.rules)
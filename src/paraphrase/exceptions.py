@@ -26,3 +26,21 @@ class ListOpNotSupportedError(Exception):
     """Raised when an unsupported operation is attempted on a list."""
 
     pass
+
+
+class CheckpointMismatchError(Exception):
+    """Raised when resuming from a checkpoint written with other settings."""
+
+    pass
+
+
+class HandlerError(Exception):
+    """Raised when a value handler fails on a gene field."""
+
+    pass
+
+
+class SampleProcessingError(Exception):
+    """Raised when a loaded sample cannot be processed."""
+
+    pass
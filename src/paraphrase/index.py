@@ -0,0 +1,117 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .io import COMPACT_FORMAT, STATUS_TSV_HEADER, TSV_HEADER, expand_compact
+
+INDEX_FORMAT = "paraphrase-index"
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".idx"
+
+# Column names of the TSV output formats
+TSV_COLUMNS = {
+    "tsv": TSV_HEADER.split("\t"),
+    "status": STATUS_TSV_HEADER.split("\t"),
+}
+
+
+def index_path(output: Path) -> Path:
+    """Companion index file of an output, e.g. cohort.json -> cohort.json.idx."""
+    return output.with_name(output.name + INDEX_SUFFIX)
+
+
+class SampleIndex:
+    """
+    Byte offset and length of each sample's record in one output file.
+
+    - json: the sample's value, i.e. the object after `"sample": `
+    - compact: the compact sample object; `header` locates the rule table
+    - tsv, status: the sample's rows
+    """
+
+    def __init__(self, output_format: str):
+        self.output_format = output_format
+        self.samples: Dict[str, Tuple[int, int]] = {}
+        self.header: Optional[Tuple[int, int]] = None
+
+    def add(self, sample: str, offset: int, length: int) -> None:
+        self.samples[sample] = (offset, length)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "format": INDEX_FORMAT,
+            "version": INDEX_VERSION,
+            "output_format": self.output_format,
+            "samples": {sample: list(span) for sample, span in self.samples.items()},
+        }
+        if self.header is not None:
+            data["header"] = list(self.header)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SampleIndex":
+        if data.get("format") != INDEX_FORMAT:
+            raise ValueError("Not a paraphrase index file")
+        index = cls(data["output_format"])
+        index.samples = {
+            sample: (offset, length)
+            for sample, (offset, length) in data["samples"].items()
+        }
+        if data.get("header") is not None:
+            index.header = tuple(data["header"])
+        return index
+
+    def save(self, file: Path) -> None:
+        with file.open("w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+            f.write("\n")
+
+    @classmethod
+    def load(cls, file: Path) -> "SampleIndex":
+        with file.open("r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def _read_span(f, span: Tuple[int, int]) -> str:
+    offset, length = span
+    f.seek(offset)
+    return f.read(length).decode("utf-8")
+
+
+def read_sample(output: Path, sample: str, index: Optional[SampleIndex] = None) -> Any:
+    """
+    Read one sample from an indexed output by seeking to its record, without
+    parsing the rest of the file.
+
+    Returns the sample's {gene: info} for json and compact outputs (compact
+    status_matches are expanded), and its rows as dicts for tsv and status
+    outputs.
+    Pass a loaded `index` to avoid re-reading it for every lookup. Raises
+    KeyError if the sample is not in the index.
+    """
+    if index is None:
+        index = SampleIndex.load(index_path(output))
+    if sample not in index.samples:
+        raise KeyError(f"Sample {sample!r} not found in index of {output}")
+
+    with output.open("rb") as f:
+        record = _read_span(f, index.samples[sample])
+        if index.output_format in TSV_COLUMNS:
+            columns = TSV_COLUMNS[index.output_format]
+            return [dict(zip(columns, row.split("\t"))) for row in record.splitlines()]
+        data = json.loads(record)
+        if index.output_format == "compact":
+            rules = json.loads(_read_span(f, index.header)) if index.header else {}
+            compact = {
+                "format": COMPACT_FORMAT,
+                "rules": rules,
+                "samples": {sample: data},
+            }
+            return expand_compact(compact)[sample]
+        return data
+
+
+def read_samples(output: Path, samples: List[str]) -> Dict[str, Any]:
+    """Read several samples from an indexed output, loading its index once."""
+    index = SampleIndex.load(index_path(output))
+    return {sample: read_sample(output, sample, index) for sample in samples}
@@ -1,16 +1,31 @@
+from collections.abc import Mapping
 from pathlib import Path
 import coloredlogs
 import yaml
 import json
 import logging
 from .exceptions import JSONLoadError, YAMLLoadError
-from typing import Dict
+from .rules_engine import GeneRules, lookup_gene_rules
+from typing import AbstractSet, Any, Dict, Iterator, List, Optional
+
+COMPACT_FORMAT = "paraphrase-compact"
+COMPACT_VERSION = 1
+COMPACT_SEPARATORS = (",", ":")
 
 coloredlogs.install(level="INFO")
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 
+def json_default(value: Any) -> Any:
+    """
+    json.dumps fallback for mapping views (e.g. lazily processed genes).
+    """
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 def load_yaml(file: Path):
     try:
         with file.open("r", encoding="utf-8") as f:
@@ -19,38 +34,214 @@ def load_yaml(file: Path):
         raise YAMLLoadError(f"Failed to read YAML file {file}: {e}")
 
 
-def load_json(file: Path):
-    """Load one JSON file and process its contents."""
+class StringPool:
+    """
+    Bounded pool used to share one object per repeated short string.
+
+    Paraphase JSONs repeat the same gene names, metric keys and haplotype names
+    in every sample; pooling them at parse time means a cohort held in memory
+    stores each of them once. Long strings (sequences, haplotype bit strings)
+    are mostly unique and are left alone, and the pool stops growing once full
+    so it cannot turn into a leak. Unlike sys.intern, pooled strings are
+    freed with the pool, so scope one to the run or collection that keeps the
+    samples.
+    """
+
+    def __init__(self, max_length: int = 40, max_size: int = 100_000):
+        self.max_length = max_length
+        self.max_size = max_size
+        self._strings: Dict[str, str] = {}
+
+    def __call__(self, value: str) -> str:
+        if len(value) > self.max_length:
+            return value
+        pooled = self._strings.get(value)
+        if pooled is not None:
+            return pooled
+        if len(self._strings) < self.max_size:
+            self._strings[value] = value
+        return value
+
+    def object_pairs_hook(self, pairs: List[tuple]) -> Dict[str, Any]:
+        """
+        json object_pairs_hook that pools keys and short string values.
+        """
+        return {
+            self(key): self(value) if isinstance(value, str) else value
+            for key, value in pairs
+        }
+
+
+def read_json_bytes(file: Path) -> bytes:
+    """Read one JSON file's raw contents, without parsing them."""
     try:
-        with file.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return file.read_bytes()
     except Exception as e:
         raise JSONLoadError(f"Failed to read JSON file {file}: {e}")
 
 
+def project_sample(
+    data: Dict[str, Any], projection: Dict[str, Optional[AbstractSet[str]]]
+) -> Dict[str, Any]:
+    """
+    Keep only the genes (case-insensitive) and top-level gene fields in
+    `projection`, e.g. from rules_engine.rules_projection. A None field set
+    keeps all of a gene's fields.
+    """
+    projected = {}
+    for gene, info in data.items():
+        gene_key = gene.lower() if isinstance(gene, str) else gene
+        if gene_key not in projection:
+            continue
+        fields = projection[gene_key]
+        if fields is not None and isinstance(info, dict):
+            info = {key: value for key, value in info.items() if key in fields}
+        projected[gene] = info
+    return projected
+
+
+def parse_json(
+    content: bytes,
+    file: Path,
+    projection: Optional[Dict[str, Optional[AbstractSet[str]]]] = None,
+    pool: Optional[StringPool] = None,
+):
+    """
+    Parse JSON contents read from `file` (used in error messages).
+
+    With a `projection`, everything outside it is dropped right after parsing.
+    Pass a `pool` when the parsed samples are kept in memory, e.g. a whole
+    cohort: repeated keys and short values are then shared through it. The
+    pooling hook keeps the parse out of the C decoder's fast path, so leave it
+    out for samples that are streamed and discarded.
+    """
+    try:
+        if pool is not None:
+            data = json.loads(content, object_pairs_hook=pool.object_pairs_hook)
+        else:
+            data = json.loads(content)
+        if projection is not None:
+            return project_sample(data, projection)
+        return data
+    except Exception as e:
+        raise JSONLoadError(f"Failed to read JSON file {file}: {e}")
+
+
+def load_json(
+    file: Path,
+    projection: Optional[Dict[str, Optional[AbstractSet[str]]]] = None,
+    pool: Optional[StringPool] = None,
+):
+    """Load one JSON file and process its contents."""
+    return parse_json(read_json_bytes(file), file, projection, pool)
+
+
+def compact_rule_table(rules: Optional[Dict[str, Any]]) -> Dict[str, List[Dict]]:
+    """
+    Rule definitions per gene, indexed by rule_index, for the compact header.
+    """
+    table = {}
+    for gene, gene_rules in (rules or {}).items():
+        if isinstance(gene_rules, GeneRules):
+            table[gene] = list(gene_rules.source)
+        elif gene_rules:
+            table[gene] = list(gene_rules.get("rules") or [])
+    return table
+
+
+def compact_sample(sample_data: Dict, rules: Optional[Dict[str, Any]]) -> Dict:
+    """
+    Replace full status_matches entries with [rules_gene, rule_index] references.
+    """
+    compact = {}
+    for gene, gene_info in sample_data.items():
+        matches = gene_info.get("status_matches")
+        if matches:
+            rules_gene, _ = lookup_gene_rules(gene, rules or {})
+            gene_info = dict(gene_info)
+            gene_info["status_matches"] = [
+                [rules_gene, match["rule_index"]] for match in matches
+            ]
+        compact[gene] = gene_info
+    return compact
+
+
+def expand_compact(compact: Dict) -> Dict:
+    """
+    Expand compact output back to the regular {sample: {gene: info}} structure.
+    """
+    if compact.get("format") != COMPACT_FORMAT:
+        raise ValueError("Not a compact paraphrase JSON document")
+
+    rule_table = compact.get("rules") or {}
+    expanded = {}
+    for sample, sample_data in compact["samples"].items():
+        expanded[sample] = {}
+        for gene, gene_info in sample_data.items():
+            references = gene_info.get("status_matches")
+            if references:
+                gene_info = dict(gene_info)
+                gene_info["status_matches"] = [
+                    {
+                        "status": rule_table[rules_gene][rule_index].get("status"),
+                        "rule_index": rule_index,
+                        "reason": rule_table[rules_gene][rule_index].get("reason"),
+                        "rule": rule_table[rules_gene][rule_index],
+                    }
+                    for rules_gene, rule_index in references
+                ]
+            expanded[sample][gene] = gene_info
+    return expanded
+
+
+def load_compact_json(file: Path) -> Dict:
+    """Load a compact output file and expand it."""
+    return expand_compact(load_json(file))
+
+
+TSV_HEADER = "sample\tlocus\tstatus\tmetric\tvalue"
+STATUS_TSV_HEADER = "sample\tgene\tstatus"
+
+
+def tsv_rows(sample: str, loci: Dict) -> Iterator[str]:
+    """
+    Yield the TSV rows (without newline) for one sample.
+    """
+    for locus, locus_info in loci.items():
+        # Gene-level status comes from the rules engine; if no rules were
+        # defined or no status was set, report it as "unknown"
+        locus_status = locus_info.get("status")
+        if not isinstance(locus_status, str):
+            locus_status = "unknown"
+
+        # Iterate over locus information, e.g. region_depth, final_haplotypes, etc.
+        for locus_metric, locus_metric_value in locus_info.items():
+            # Do not emit the per-gene status or rule-match metadata as separate rows
+            if locus_metric in {"status", "status_matches"}:
+                continue
+            prettified_value = stringify_value(locus_metric_value)
+            yield f"{sample}\t{locus}\t{locus_status}\t{locus_metric}\t{prettified_value}"
+
+
+def status_rows(sample: str, loci: Dict) -> Iterator[str]:
+    """
+    Yield one status row (without newline) per gene that rules classified.
+    """
+    for locus, locus_info in loci.items():
+        locus_status = locus_info.get("status")
+        if isinstance(locus_status, str):
+            yield f"{sample}\t{locus}\t{locus_status}"
+
+
 def print_tsv(json_data: Dict) -> None:
     """
     Print results in TSV format.
     """
-    print("sample\tlocus\tstatus\tmetric\tvalue")
-
-    for sample, locus in json_data.items():
-        for locus, locus_info in locus.items():
-            # Gene-level status comes from the rules engine; if no rules were
-            # defined or no status was set, report it as "unknown"
-            locus_status = locus_info.get("status")
-            if not isinstance(locus_status, str):
-                locus_status = "unknown"
-
-            # Iterate over locus information, e.g. region_depth, final_haplotypes, etc.
-            for locus_metric, locus_metric_value in locus_info.items():
-                # Do not emit the per-gene status or rule-match metadata as separate rows
-                if locus_metric in {"status", "status_matches"}:
-                    continue
-                prettified_value = stringify_value(locus_metric_value)
-                print(
-                    f"{sample}\t{locus}\t{locus_status}\t{locus_metric}\t{prettified_value}"
-                )
+    print(TSV_HEADER)
+
+    for sample, loci in json_data.items():
+        for row in tsv_rows(sample, loci):
+            print(row)
 
 
 def stringify_value(content) -> str | None:
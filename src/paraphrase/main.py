@@ -1,14 +1,37 @@
 #!/usr/bin/env python3
-import json
 from pathlib import Path
 from typing import List, Optional
 import importlib.metadata
 import typer
 from .constants import DEFAULT_SKIP_KEYS
-from .pipeline import merge_and_process, assert_equal_inputs_and_samples
-from .io import load_json, load_yaml, print_tsv
-from .exceptions import InputMismatchError
+from .pipeline import (
+    assert_equal_inputs_and_samples,
+    collect_cohort_statistics,
+    process_samples,
+    write_error_report,
+)
+from .checkpoint import Checkpoint
+from .cohort import CohortStatistics
+from .io import load_yaml
+from .sinks import (
+    StatusSink,
+    SummarySink,
+    check_single_stdout,
+    create_sink,
+    parse_sink_spec,
+)
+from .exceptions import (
+    CheckpointMismatchError,
+    HandlerError,
+    InputMismatchError,
+    JSONLoadError,
+    SampleProcessingError,
+    YAMLLoadError,
+)
 from .config import ProcessingConfig
+from .profiling import RuleProfiler
+from .stages import DEFAULT_QUEUE_DEPTH
+from .rules_engine import cohort_metrics, compile_rules, rules_projection
 
 APP_NAME = "paraphrase"
 
@@ -74,7 +97,87 @@ def main(
         None, help="Optional comma-separated list of gene names to process"
     ),
     output_format: str = typer.Option(
-        "json", "--output-format", "-o", help="Output format: 'json' (default) or 'tsv'"
+        "json",
+        "--output-format",
+        "-o",
+        help="Output format: 'json' (default), 'compact' or 'tsv'",
+    ),
+    outputs: Optional[List[str]] = typer.Option(
+        None,
+        "--out",
+        help="Output sink as FORMAT:PATH (json, compact, tsv, status, summary or cohort-stats; PATH '-' is stdout). "
+        "Can be given multiple times; replaces --output-format",
+    ),
+    status_only: bool = typer.Option(
+        False,
+        "--status-only",
+        help="Only write sample/gene/status rows; only the gene fields that the rules read are "
+        "loaded and processed (requires --rules)",
+    ),
+    index: bool = typer.Option(
+        False,
+        "--index",
+        help="Write a <output>.idx offset index next to each json, compact or tsv output file "
+        "for random access to single samples",
+    ),
+    summary_file: Optional[Path] = typer.Option(
+        None,
+        "--summary",
+        file_okay=True,
+        dir_okay=False,
+        help="Optional JSON file for per-gene cohort summary statistics",
+    ),
+    cohort_stats: Optional[Path] = typer.Option(
+        None,
+        "--cohort-stats",
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        help="Reference cohort statistics for cohort-relative rules (zscore_gt, percentile_lt, ...); "
+        "by default they are computed from the input samples",
+    ),
+    rule_stats: Optional[Path] = typer.Option(
+        None,
+        "--rule-stats",
+        file_okay=True,
+        dir_okay=False,
+        help="Optional TSV file with per-rule evaluation counts, matches and time (requires --rules)",
+    ),
+    continue_on_error: bool = typer.Option(
+        False,
+        "--continue-on-error",
+        help="Skip samples that fail to load or process instead of aborting",
+    ),
+    error_report: Optional[Path] = typer.Option(
+        None,
+        "--error-report",
+        file_okay=True,
+        dir_okay=False,
+        help="Optional TSV file listing samples that failed (with --continue-on-error)",
+    ),
+    checkpoint_file: Optional[Path] = typer.Option(
+        None,
+        "--checkpoint",
+        file_okay=True,
+        dir_okay=False,
+        help="Optional file recording completed samples and their results",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Skip samples already completed in the --checkpoint file",
+    ),
+    read_queue: int = typer.Option(
+        DEFAULT_QUEUE_DEPTH,
+        "--read-queue",
+        min=0,
+        help="Number of input files read ahead of processing on a reader thread (0 reads inline)",
+    ),
+    write_queue: int = typer.Option(
+        DEFAULT_QUEUE_DEPTH,
+        "--write-queue",
+        min=0,
+        help="Number of processed samples queued for the writer thread (0 writes inline)",
     ),
     version: bool = typer.Option(
         False,
@@ -97,24 +200,95 @@ def main(
         )
         genes_list = [g.strip().lower() for g in genes.split(",")] if genes else None
         assert_equal_inputs_and_samples(input, sample)
+        if resume and checkpoint_file is None:
+            raise typer.BadParameter("--resume requires --checkpoint")
+        if rule_stats and not rules_yaml:
+            raise typer.BadParameter("--rule-stats requires --rules")
+        if status_only and not rules_yaml:
+            raise typer.BadParameter("--status-only requires --rules")
+        if status_only and summary_file:
+            raise typer.BadParameter("--status-only cannot be combined with --summary")
 
-        # Get input files
-        rules = load_yaml(rules_yaml) if rules_yaml else None
-        json_data_list = [load_json(f) for f in input]
+        try:
+            rules = compile_rules(load_yaml(rules_yaml) or {}) if rules_yaml else None
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="--rules")
 
         config = ProcessingConfig(
             skip_keys=set(skip_keys_list),
             genes_list=genes_list,
             rules=rules,
+            profiler=RuleProfiler(rules) if rule_stats else None,
+            # Status-only runs load and process just the fields rules read
+            projection=rules_projection(rules) if status_only else None,
         )
 
-        merged_data = merge_and_process(json_data_list, sample, config)
+        # Cohort-relative rules need statistics before any sample is evaluated
+        metrics = cohort_metrics(rules) if rules else set()
+        if cohort_stats:
+            try:
+                config.cohort = CohortStatistics.load(cohort_stats)
+            except (OSError, ValueError, KeyError) as e:
+                raise typer.BadParameter(
+                    f"Failed to read cohort statistics: {e}",
+                    param_hint="--cohort-stats",
+                )
+        elif metrics:
+            config.cohort = collect_cohort_statistics(
+                input, sample, config, metrics, continue_on_error, read_queue
+            )
 
-        if output_format.lower() == "tsv":
-            print_tsv(merged_data)
-        else:
-            typer.echo(json.dumps(merged_data, indent=2))
-    except InputMismatchError as e:
+        try:
+            sinks = (
+                [parse_sink_spec(spec, rules) for spec in outputs]
+                if outputs
+                else [
+                    create_sink("status" if status_only else output_format, rules=rules)
+                ]
+            )
+            check_single_stdout(sinks)
+            if status_only and not all(isinstance(sink, StatusSink) for sink in sinks):
+                raise ValueError("--status-only only supports 'status' outputs")
+            if index:
+                # Per-sample outputs only; summaries have no sample records
+                for sink in sinks:
+                    if sink.format_name is not None:
+                        sink.enable_index()
+        except ValueError as e:
+            raise typer.BadParameter(
+                str(e), param_hint="--out" if outputs else "--output-format"
+            )
+        if summary_file:
+            sinks.append(SummarySink(str(summary_file)))
+
+        failures = process_samples(
+            input,
+            sample,
+            config,
+            sinks,
+            checkpoint=Checkpoint(checkpoint_file) if checkpoint_file else None,
+            resume=resume,
+            continue_on_error=continue_on_error,
+            read_queue=read_queue,
+            write_queue=write_queue,
+        )
+        if config.profiler is not None:
+            config.profiler.write_tsv(rule_stats)
+        if error_report is not None:
+            write_error_report(error_report, failures)
+        if failures:
+            typer.echo(
+                f"[warning] {len(failures)} sample(s) failed and were skipped",
+                err=True,
+            )
+    except (
+        CheckpointMismatchError,
+        HandlerError,
+        InputMismatchError,
+        JSONLoadError,
+        SampleProcessingError,
+        YAMLLoadError,
+    ) as e:
         typer.echo(f"[error] {e}", err=True)
         raise typer.Exit(code=1)
 
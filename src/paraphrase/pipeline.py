@@ -1,21 +1,239 @@
+from collections import Counter
+from contextlib import ExitStack, closing
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+import logging
 from .processors import process_paraphase_json
-from .exceptions import InputMismatchError
+from .exceptions import (
+    HandlerError,
+    InputMismatchError,
+    JSONLoadError,
+    SampleProcessingError,
+)
 from .config import ProcessingConfig
+from .checkpoint import Checkpoint, CheckpointEntry, config_fingerprint
+from .cohort import CohortStatistics
+from .io import StringPool, parse_json, read_json_bytes
+from .sinks import Sink
+from .stages import DEFAULT_QUEUE_DEPTH, BackgroundWriter, read_ahead
 
+logger = logging.getLogger(__name__)
 
-def merge_and_process(
-    json_dicts: list[dict], sample_names: list[str], config: ProcessingConfig
+
+@dataclass(frozen=True)
+class SampleFailure:
+    sample: str
+    file: Path
+    error: str
+
+
+def process_sample(
+    file: Path,
+    sample_name: str,
+    config: ProcessingConfig,
+    content: Optional[bytes] = None,
+    pool: Optional[StringPool] = None,
+    materialize: bool = False,
 ) -> dict:
     """
-    Merge multiple JSON files with sample_names as keys.
+    Parse and process one sample JSON, reading it unless its `content` was
+    already read. Pass a string `pool` if the result is kept in memory, and
+    `materialize` if every field of it will be read (see
+    process_paraphase_json).
+
+    Raises JSONLoadError if the file cannot be read or parsed, and
+    SampleProcessingError if its contents cannot be processed.
+    """
+    if content is None:
+        content = read_json_bytes(file)
+    data = parse_json(content, file, config.projection, pool)
+    try:
+        return process_paraphase_json(data, config, materialize)
+    except (AttributeError, HandlerError, KeyError, TypeError, ValueError) as e:
+        raise SampleProcessingError(
+            f"Failed to process sample {sample_name} ({file}): {e!r}"
+        ) from e
+
+
+@dataclass(frozen=True)
+class _ReadSample:
+    sample: str
+    file: Path
+    # None for samples taken from the checkpoint, or if reading failed
+    content: Optional[bytes] = None
+    error: Optional[JSONLoadError] = None
+
+
+def _read_samples(
+    input_files: List[Path],
+    sample_names: List[str],
+    completed: Dict[str, CheckpointEntry],
+) -> Iterator[_ReadSample]:
+    """
+    Read stage: raw file contents, in input order. Samples completed from the
+    same input file are not read.
+    """
+    for file, sample_name in zip(input_files, sample_names):
+        sample_name = str(sample_name)
+        if sample_name in completed and completed[sample_name].file == str(file):
+            yield _ReadSample(sample_name, file)
+            continue
+        try:
+            read = _ReadSample(sample_name, file, content=read_json_bytes(file))
+        except JSONLoadError as e:
+            read = _ReadSample(sample_name, file, error=e)
+        yield read
+
+
+def process_samples(
+    input_files: List[Path],
+    sample_names: List[str],
+    config: ProcessingConfig,
+    sinks: List[Sink],
+    checkpoint: Optional[Checkpoint] = None,
+    resume: bool = False,
+    continue_on_error: bool = False,
+    read_queue: int = DEFAULT_QUEUE_DEPTH,
+    write_queue: int = DEFAULT_QUEUE_DEPTH,
+) -> List[SampleFailure]:
+    """
+    Process samples one at a time, fanning each result out to all sinks, and
+    return the list of failures.
+
+    Samples flow through a stage pipeline: a reader thread reads the next
+    files (read), the calling thread parses, processes and classifies each
+    sample (parse, process, classify), and a writer thread records and
+    serializes results to the sinks (write). Stages are connected by bounded
+    queues of `read_queue` and `write_queue` samples, so disk reads and writes
+    overlap with processing while memory stays bounded; a depth of 0 runs that
+    stage inline. Sample order is preserved.
+
+    - checkpoint: every completed sample is recorded as soon as it is done.
+    - resume: samples already in the checkpoint are not reprocessed; their
+      recorded results are reused. A checkpoint written with other processing
+      settings raises CheckpointMismatchError, and samples recorded for another
+      input file are reprocessed.
+    - continue_on_error: a sample that fails to load or process is recorded as
+      a failure and skipped instead of aborting the batch.
+    """
+    fingerprint = config_fingerprint(config) if checkpoint is not None else None
+    completed = (
+        checkpoint.load(fingerprint) if checkpoint is not None and resume else {}
+    )
+    if completed:
+        logger.info(f"Resuming: {len(completed)} sample(s) already completed")
+
+    # Only worth pooling strings if some sink keeps the samples; the pool
+    # lives for this run only
+    pool = StringPool() if any(sink.retains_samples for sink in sinks) else None
+    # Handle every field up front only if some output reads them all anyway;
+    # malformed fields then fail the sample instead of the write
+    materialize = checkpoint is not None or any(sink.reads_all_fields for sink in sinks)
+
+    def write(item: Tuple[str, Path, dict, bool]) -> None:
+        sample_name, file, processed_json, record = item
+        if record and checkpoint is not None:
+            checkpoint.record(sample_name, str(file), processed_json)
+        for sink in sinks:
+            sink.write_sample(sample_name, processed_json)
+
+    failures: List[SampleFailure] = []
+    # On exit, also after a failure, samples processed so far are written and
+    # recorded, then the checkpoint and every sink are closed, so outputs stay
+    # complete and well-formed for those samples.
+    with ExitStack() as stack:
+        if checkpoint is not None:
+            checkpoint.open(fingerprint, completed)
+            stack.callback(checkpoint.close)
+        for sink in sinks:
+            sink.open()
+            stack.callback(sink.close)
+        writer = BackgroundWriter(write, write_queue)
+        stack.callback(writer.close)
+        reads = read_ahead(
+            _read_samples(input_files, sample_names, completed), read_queue
+        )
+        with closing(reads):
+            for read in reads:
+                if read.content is None and read.error is None:
+                    result = completed[read.sample].result
+                    writer.submit((read.sample, read.file, result, False))
+                    continue
+                try:
+                    if read.error is not None:
+                        raise read.error
+                    processed_json = process_sample(
+                        read.file,
+                        read.sample,
+                        config,
+                        read.content,
+                        pool,
+                        materialize,
+                    )
+                except (JSONLoadError, SampleProcessingError) as e:
+                    if not continue_on_error:
+                        raise
+                    logger.warning(f"Skipping sample {read.sample}: {e}")
+                    failures.append(SampleFailure(read.sample, read.file, str(e)))
+                    continue
+                writer.submit((read.sample, read.file, processed_json, True))
+
+    return failures
+
+
+def collect_cohort_statistics(
+    input_files: List[Path],
+    sample_names: List[str],
+    config: ProcessingConfig,
+    metrics: Optional[Set[Tuple[str, str]]] = None,
+    continue_on_error: bool = False,
+    read_queue: int = DEFAULT_QUEUE_DEPTH,
+) -> CohortStatistics:
+    """
+    First pass over the cohort for cohort-relative rules: collect statistics
+    for the (gene, path) metrics the rules reference, once, before any rule is
+    evaluated. Rules are not applied in this pass. Samples that fail are
+    skipped when continuing on error; the main pass reports them.
+
+    With `metrics`, exactly the genes they name are processed, whether or not
+    they are in the config's genes_list (cross-gene rules read genes that are
+    not in the output).
+    """
+    genes_list = sorted({gene for gene, _ in metrics}) if metrics else None
+    config = replace(
+        config,
+        rules=None,
+        cohort=None,
+        genes_list=genes_list or config.genes_list,
+    )
+    cohort = CohortStatistics()
+    reads = read_ahead(_read_samples(input_files, sample_names, {}), read_queue)
+    with closing(reads):
+        for read in reads:
+            try:
+                if read.error is not None:
+                    raise read.error
+                processed_json = process_sample(
+                    read.file, read.sample, config, read.content
+                )
+            except (JSONLoadError, SampleProcessingError):
+                if not continue_on_error:
+                    raise
+                continue
+            cohort.add_sample(processed_json, metrics)
+    return cohort
+
+
+def write_error_report(file: Path, failures: List[SampleFailure]) -> None:
+    """
+    Write per-sample failures as TSV.
     """
-    merged_data = {}
-    for data, sample_name in zip(json_dicts, sample_names):
-        processed_json = process_paraphase_json(data, config)
-        merged_data[str(sample_name)] = processed_json
-    return merged_data
+    with file.open("w", encoding="utf-8") as f:
+        f.write("sample\tfile\terror\n")
+        for failure in failures:
+            error = " ".join(failure.error.split())
+            f.write(f"{failure.sample}\t{failure.file}\t{error}\n")
 
 
 def assert_equal_inputs_and_samples(input_files: List[Path], sample_names: List[str]):
@@ -24,3 +242,10 @@ def assert_equal_inputs_and_samples(input_files: List[Path], sample_names: List[
             f"Number of input files ({len(input_files)}) does not match "
             f"number of sample names ({len(sample_names)})"
         )
+    counts = Counter(map(str, sample_names))
+    duplicates = [sample_name for sample_name, count in counts.items() if count > 1]
+    if duplicates:
+        # Outputs and the checkpoint are keyed by sample name
+        raise InputMismatchError(
+            f"Sample names must be unique, duplicated: {', '.join(duplicates)}"
+        )
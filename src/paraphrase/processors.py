@@ -1,41 +1,63 @@
+from collections.abc import Mapping, MutableMapping
+from typing import AbstractSet, Any, Callable, Dict, Iterator, Optional, Set, Tuple
 from .config import ProcessingConfig
-from .rules_engine import evaluate_gene_rules
+from .exceptions import HandlerError
+from .rules_engine import evaluate_gene_rules, evaluation_order, referenced_genes
 
 
-def process_paraphase_json(data: dict, config: ProcessingConfig) -> dict:
+def process_paraphase_json(
+    data: dict, config: ProcessingConfig, materialize: bool = False
+) -> dict:
     """
     Process a single sample JSON structure, applying handlers and optionally filtering genes.
+
+    Each gene is returned as a GeneView whose handlers run as fields are read,
+    so fields nobody reads are never handled. Set `materialize` if every field
+    will be read (e.g. for JSON or TSV output): all fields are then handled
+    before returning, so a malformed sample fails here (with HandlerError)
+    rather than later while it is written.
+    With a projection in the config, only the genes and fields it lists are
+    kept.
     """
     skip_keys = config.skip_keys
     genes_to_keep = (
         {g.lower() for g in config.genes_list} if config.genes_list else None
     )
 
-    handlers = {
-        "region_depth": handle_region_depth,
-        "final_haplotypes": handle_final_haplotypes,
-        "phase_region": handle_phase_region,
-        "smn_del78_haplotypes": handle_final_haplotypes,
-        "smn2_del78_haplotypes": handle_final_haplotypes,
-        "smn1_haplotypes": handle_final_haplotypes,
-        "smn2_haplotypes": handle_final_haplotypes,
-        "fusions_called": handle_fusions_called,
-        "flanking_summary": handle_dict_to_list,
-    }
-
     if genes_to_keep:
-        # Keep only selected genes (case-insensitive)
-        data = {
-            gene: info for gene, info in data.items() if gene.lower() in genes_to_keep
-        }
+        # Keep only selected genes (case-insensitive), plus the genes their
+        # rules read, which are dropped again after classification
+        evaluated = (
+            referenced_genes(genes_to_keep, config.rules)
+            if config.rules
+            else genes_to_keep
+        )
+        data = {gene: info for gene, info in data.items() if gene.lower() in evaluated}
 
-    out = {}
-    for gene, info in data.items():
-        processed = process_gene_info(info, handlers, skip_keys)
+    projection = config.projection
+    if projection is None:
+        out = {gene: GeneView(info, HANDLERS, skip_keys) for gene, info in data.items()}
+    else:
+        out = {
+            gene: GeneView(info, HANDLERS, skip_keys, projection[gene.lower()])
+            for gene, info in data.items()
+            if gene.lower() in projection
+        }
 
-        # Optional, per-gene classification rules
-        if config.rules:
-            status, matches = evaluate_gene_rules(gene, processed, config.rules)
+    # Optional, per-gene classification rules, evaluated in dependency order so
+    # that rules reading another gene's status see it already set
+    if config.rules:
+        genes = {gene.lower(): processed for gene, processed in out.items()}
+        for gene in evaluation_order(out, config.rules):
+            processed = out[gene]
+            status, matches = evaluate_gene_rules(
+                gene,
+                processed,
+                config.rules,
+                cohort=config.cohort,
+                genes=genes,
+                profiler=config.profiler,
+            )
             if status is not None:
                 processed["status"] = status
                 # Keep a lightweight trace in json
@@ -50,27 +72,187 @@ def process_paraphase_json(data: dict, config: ProcessingConfig) -> dict:
                         for m in matches
                     ]
 
-        out[gene] = processed
-
+    if genes_to_keep:
+        out = {
+            gene: processed
+            for gene, processed in out.items()
+            if gene.lower() in genes_to_keep
+        }
+    if materialize:
+        for processed in out.values():
+            processed.materialize()
     return out
 
 
-def process_gene_info(gene_info, handlers, skip_keys):
+class GeneView(MutableMapping):
     """
-    Apply per-key handlers and drop skipped/None values under a gene.
+    Lazy mapping over one gene's raw info.
+
+    Skipped keys and None values are hidden. A handler from the dispatch table
+    is applied the first time its key is read and the result is memoized.
+    Handler failures raise HandlerError (never KeyError), so `get` and `in`
+    cannot mistake a malformed field for a missing one. Keys assigned on the
+    view (e.g. "status") are kept alongside without touching the raw dict.
+    If `fields` is given, raw keys outside it are hidden too.
+    """
+
+    __slots__ = ("_raw", "_handlers", "_skip_keys", "_fields", "_values", "_removed")
+
+    def __init__(
+        self,
+        raw: Dict[str, Any],
+        handlers: Dict[str, Callable[[Any], Any]],
+        skip_keys: Set[str],
+        fields: Optional[AbstractSet[str]] = None,
+    ):
+        self._raw = raw
+        self._handlers = handlers
+        self._skip_keys = skip_keys
+        self._fields = fields
+        self._values: Dict[str, Any] = {}
+        self._removed: Set[str] = set()
+
+    def _in_raw(self, key: str) -> bool:
+        return (
+            key not in self._skip_keys
+            and (self._fields is None or key in self._fields)
+            and key not in self._removed
+            and self._raw.get(key) is not None
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        if not self._in_raw(key):
+            raise KeyError(key)
+        value = self._raw[key]
+        handler = self._handlers.get(key)
+        if handler is not None:
+            try:
+                value = handler(value)
+            except Exception as e:
+                raise HandlerError(f"Failed to handle field '{key}': {e!r}") from e
+        self._values[key] = value
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # Same as Mapping.get, spelled out so only a missing key gives `default`
+        if key not in self:
+            return default
+        return self[key]
+
+    def materialize(self) -> None:
+        """Apply the handlers of every visible key that has not been read yet."""
+        for key in self:
+            self[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._values[key] = value
+        self._removed.discard(key)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._values.pop(key, None)
+        self._removed.add(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values or self._in_raw(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._raw:
+            if self._in_raw(key):
+                yield key
+        for key in self._values:
+            if not self._in_raw(key):
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"GeneView({dict(self)!r})"
+
+
+class _KeyLayout:
     """
-    processed = {}
-    for gene_metric, gene_metric_value in gene_info.items():
-        if gene_metric in skip_keys or gene_metric_value is None:
-            continue
+    Key order and key -> position index shared by every record with those keys.
+    """
+
+    __slots__ = ("keys", "index")
+
+    def __init__(self, keys: Tuple[str, ...]):
+        self.keys = keys
+        self.index = {key: position for position, key in enumerate(keys)}
 
-        if gene_metric in handlers:
-            gene_metric_value = handlers[gene_metric](gene_metric_value)
 
-        # TODO: Stringify values here instead, for both JSON and TSV output?
-        processed[gene_metric] = gene_metric_value
+_KEY_LAYOUTS: Dict[Tuple[str, ...], _KeyLayout] = {}
 
-    return processed
+
+def _key_layout(keys: Tuple[str, ...]) -> _KeyLayout:
+    layout = _KEY_LAYOUTS.get(keys)
+    if layout is None:
+        layout = _KEY_LAYOUTS.setdefault(keys, _KeyLayout(keys))
+    return layout
+
+
+class GeneRecord(Mapping):
+    """
+    Immutable, array-backed processed gene result for holding many samples in memory.
+
+    Values are stored in a tuple; the key order and lookup index live in a
+    layout shared by all records with the same keys (typically every sample
+    for a given gene), so per-record cost is one tuple. Serializes to the same
+    JSON and TSV as the equivalent dict.
+    """
+
+    __slots__ = ("_layout", "_values")
+
+    def __init__(self, layout: _KeyLayout, values: Tuple[Any, ...]):
+        self._layout = layout
+        self._values = values
+
+    @classmethod
+    def from_mapping(cls, mapping: Mapping) -> "GeneRecord":
+        items = tuple(mapping.items())
+        keys = tuple(key for key, _ in items)
+        return cls(_key_layout(keys), tuple(value for _, value in items))
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._layout.index[key]]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._layout.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._layout.keys)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"GeneRecord({dict(self)!r})"
+
+
+def freeze_sample(processed: Dict[str, Mapping]) -> Dict[str, GeneRecord]:
+    """
+    Convert a processed sample into compact records for long-lived storage.
+    """
+    return {
+        gene: info if isinstance(info, GeneRecord) else GeneRecord.from_mapping(info)
+        for gene, info in processed.items()
+    }
+
+
+def process_gene_info(gene_info, handlers, skip_keys, fields=None):
+    """
+    Apply per-key handlers and drop skipped/None values under a gene.
+    If `fields` is given, only those keys are kept.
+    """
+    # TODO: Stringify values here instead, for both JSON and TSV output?
+    return dict(GeneView(gene_info, handlers, skip_keys, fields))
 
 
 def handle_region_depth(value):
@@ -143,3 +325,17 @@ def handle_phase_region(content: str | None) -> list[str]:
         return []
 
     return [region.split(":", 1)[1] for region in content.split(",") if ":" in region]
+
+
+# Dispatch table of per-key handlers applied to each gene's raw values.
+HANDLERS = {
+    "region_depth": handle_region_depth,
+    "final_haplotypes": handle_final_haplotypes,
+    "phase_region": handle_phase_region,
+    "smn_del78_haplotypes": handle_final_haplotypes,
+    "smn2_del78_haplotypes": handle_final_haplotypes,
+    "smn1_haplotypes": handle_final_haplotypes,
+    "smn2_haplotypes": handle_final_haplotypes,
+    "fusions_called": handle_fusions_called,
+    "flanking_summary": handle_dict_to_list,
+}
@@ -0,0 +1,84 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .rules_engine import GeneRules
+
+RULE_STATS_HEADER = (
+    "gene\trule_index\tstatus\tevaluations\tmatches\tleaf_evaluations\t"
+    "total_seconds\tmean_microseconds"
+)
+
+
+@dataclass(slots=True)
+class RuleStats:
+    status: Optional[str] = None
+    evaluations: int = 0
+    matches: int = 0
+    leaf_evaluations: int = 0
+    seconds: float = 0.0
+
+    @property
+    def mean_microseconds(self) -> float:
+        if not self.evaluations:
+            return 0.0
+        return 1e6 * self.seconds / self.evaluations
+
+
+class RuleProfiler:
+    """
+    Per-(gene, rule_index) evaluation statistics across a run.
+
+    Pass one as `profiler` to evaluate_gene_rules (or set it on the
+    ProcessingConfig); without a profiler the rules engine skips all timing
+    and counting. Seeding it with the compiled rules lists rules that were
+    never evaluated, so dead rules show up in the report too.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, Any]] = None):
+        self.stats: Dict[Tuple[str, int], RuleStats] = {}
+        for gene, gene_rules in (rules or {}).items():
+            if isinstance(gene_rules, GeneRules):
+                for rule in gene_rules.rules:
+                    self.stats[(gene, rule.index)] = RuleStats(status=rule.status)
+
+    def record(
+        self, gene: str, rule_index: int, matched: bool, leaves: int, seconds: float
+    ) -> None:
+        stats = self.stats.get((gene, rule_index))
+        if stats is None:
+            stats = self.stats[(gene, rule_index)] = RuleStats()
+        stats.evaluations += 1
+        stats.matches += matched
+        stats.leaf_evaluations += leaves
+        stats.seconds += seconds
+
+    def merge(self, other: "RuleProfiler") -> None:
+        for key, stats in other.stats.items():
+            mine = self.stats.get(key)
+            if mine is None:
+                mine = self.stats[key] = RuleStats(status=stats.status)
+            mine.evaluations += stats.evaluations
+            mine.matches += stats.matches
+            mine.leaf_evaluations += stats.leaf_evaluations
+            mine.seconds += stats.seconds
+
+    def rows(self) -> List[str]:
+        """
+        Report rows (without newline), most expensive rules first.
+        """
+        ranked = sorted(
+            self.stats.items(), key=lambda item: (-item[1].seconds, item[0])
+        )
+        return [
+            f"{gene}\t{rule_index}\t{stats.status or ''}\t{stats.evaluations}\t"
+            f"{stats.matches}\t{stats.leaf_evaluations}\t{stats.seconds:.6f}\t"
+            f"{stats.mean_microseconds:.2f}"
+            for (gene, rule_index), stats in ranked
+        ]
+
+    def write_tsv(self, file: Path) -> None:
+        with file.open("w", encoding="utf-8") as f:
+            f.write(RULE_STATS_HEADER + "\n")
+            for row in self.rows():
+                f.write(row + "\n")
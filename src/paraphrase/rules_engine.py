@@ -1,6 +1,20 @@
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections.abc import Mapping
+from dataclasses import dataclass, field as dataclass_field
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 import operator
+import re
+import time
 
 NUMERIC_FUNCTIONS = {
     ">": operator.gt,
@@ -22,17 +36,122 @@ def _get_path_value(object: Any, path: str) -> Any:
     Get a possibly nested value from dict-like structures.
     Supports dot-paths like 'fusions_called.value.CFH_hap1.type'.
     """
+    return _walk(object, path.split("."))
+
+
+def _walk(object: Any, segments: Tuple[str, ...]) -> Any:
     current = object
-    for part in path.split("."):
+    for part in segments:
         if current is None:
             return None
-        if isinstance(current, dict):
+        if isinstance(current, (dict, Mapping)):
             current = current.get(part)
         else:
             return None
     return current
 
 
+def _expand(value: Any) -> List[Any]:
+    """
+    Children of a wildcard segment: dict values or list items.
+    """
+    if isinstance(value, (dict, Mapping)):
+        return list(value.values())
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return []
+
+
+WILDCARD = "*"
+
+# '@GENE.path' reads a field of another gene in the same sample
+GENE_PREFIX = "@"
+
+# Fields set by rule evaluation; reading them from another gene makes that gene
+# an evaluation dependency
+STATUS_FIELDS = {"status", "status_matches"}
+
+
+def _split_gene_path(text: str) -> Tuple[Optional[str], str]:
+    """
+    Split '@GENE.path' into (lower-cased gene, path); plain paths have no gene.
+    """
+    if not text.startswith(GENE_PREFIX):
+        return None, text
+    gene, _, path = text[len(GENE_PREFIX) :].partition(".")
+    if not gene or not path:
+        raise ValueError(f"Cross-gene paths must look like '@GENE.path', got: {text!r}")
+    return gene.lower(), path
+
+
+@dataclass(frozen=True)
+class FieldPath:
+    """
+    A dot-path split into segments once, at rule compile time.
+
+    A `*` segment matches every child of a dict (its values) or a list (its
+    items), e.g. 'fusions_called.*.type'. Wildcard paths resolve to the list of
+    non-None values found.
+    """
+
+    text: str
+    segments: Tuple[str, ...]
+    wildcard: bool
+
+    @classmethod
+    def parse(cls, text: str) -> "FieldPath":
+        segments = tuple(text.split("."))
+        return cls(text=text, segments=segments, wildcard=WILDCARD in segments)
+
+    def resolve(self, object: Any, cache: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Resolve the path against one gene's info.
+
+        `cache` is shared by all rules evaluated for the same gene, so every
+        distinct path (and every wildcard prefix) is walked once per gene no
+        matter how many rules read it.
+        """
+        if not self.wildcard:
+            if len(self.segments) == 1:
+                if isinstance(object, (dict, Mapping)):
+                    return object.get(self.text)
+                return None
+            if cache is None:
+                return _walk(object, self.segments)
+            if self.text not in cache:
+                cache[self.text] = _walk(object, self.segments)
+            return cache[self.text]
+
+        if cache is not None and self.text in cache:
+            return cache[self.text]
+
+        star = self.segments.index(WILDCARD)
+        prefix = ".".join(self.segments[: star + 1])
+        if cache is not None and prefix in cache:
+            children = cache[prefix]
+        else:
+            children = _expand(_walk(object, self.segments[:star]))
+            if cache is not None:
+                cache[prefix] = children
+
+        rest = self.segments[star + 1 :]
+        if not rest:
+            values = [child for child in children if child is not None]
+        elif WILDCARD in rest:
+            tail = FieldPath(".".join(rest), rest, True)
+            values = [value for child in children for value in tail.resolve(child)]
+        else:
+            values = [
+                value
+                for value in (_walk(child, rest) for child in children)
+                if value is not None
+            ]
+
+        if cache is not None:
+            cache[self.text] = values
+        return values
+
+
 def _coerce_numeric(x: Any) -> Optional[float]:
     """
     Coerce a value to a float.
@@ -60,11 +179,15 @@ def _op_ne(actual: Any, expected: Any) -> bool:
 
 
 def _op_in(actual: Any, expected: Any) -> bool:
-    return actual in (expected or [])
+    try:
+        return actual in (expected or ())
+    except TypeError:
+        # Unhashable values (e.g. lists) can never be members of a frozen set
+        return False
 
 
 def _op_not_in(actual: Any, expected: Any) -> bool:
-    return actual not in (expected or [])
+    return not _op_in(actual, expected)
 
 
 def _op_contains(actual: Any, expected: Any) -> bool:
@@ -75,6 +198,84 @@ def _op_not_contains(actual: Any, expected: Any) -> bool:
     return expected not in (actual or [])
 
 
+@lru_cache(maxsize=None)
+def _compile_pattern(pattern: str) -> re.Pattern:
+    """
+    Compile a regular expression once; repeated patterns share the compiled object.
+    """
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid regular expression in rules: {pattern!r}: {e}")
+
+
+def _op_matches(actual: Any, expected: Any) -> bool:
+    """
+    True if a string (or any string in a list) matches the pattern (re.search).
+    """
+    pattern = expected if isinstance(expected, re.Pattern) else None
+    if pattern is None:
+        if not isinstance(expected, str):
+            return False
+        pattern = _compile_pattern(expected)
+    if isinstance(actual, str):
+        return pattern.search(actual) is not None
+    if isinstance(actual, (list, tuple)):
+        return any(
+            isinstance(item, str) and pattern.search(item) is not None
+            for item in actual
+        )
+    return False
+
+
+def _op_not_matches(actual: Any, expected: Any) -> bool:
+    return not _op_matches(actual, expected)
+
+
+def _op_between(actual: Any, expected: Any) -> bool:
+    """
+    Inclusive numeric range check, e.g. {"between": [20, 60]}.
+    """
+    actual = _coerce_numeric(actual)
+    if actual is None:
+        return False
+    # Compiled rules carry a (low, high) tuple; raw YAML still has the list
+    low, high = expected if isinstance(expected, tuple) else _prepare_range(expected)
+    return low <= actual <= high
+
+
+def _prepare_membership(expected: Any) -> Any:
+    """
+    Freeze a YAML list into a frozenset so membership tests are O(1).
+    """
+    if expected is None:
+        return frozenset()
+    if isinstance(expected, (list, tuple, set, frozenset)):
+        try:
+            return frozenset(expected)
+        except TypeError:
+            # Unhashable members (e.g. nested lists) fall back to a linear scan
+            return tuple(expected)
+    return expected
+
+
+def _prepare_pattern(expected: Any) -> re.Pattern:
+    if not isinstance(expected, str):
+        raise ValueError(
+            f"'matches' expects a regular expression string, got: {expected!r}"
+        )
+    return _compile_pattern(expected)
+
+
+def _prepare_range(expected: Any) -> Tuple[float, float]:
+    if not isinstance(expected, (list, tuple)) or len(expected) != 2:
+        raise ValueError(f"'between' expects a [low, high] pair, got: {expected!r}")
+    low, high = (_coerce_numeric(bound) for bound in expected)
+    if low is None or high is None:
+        raise ValueError(f"'between' bounds must be numeric, got: {expected!r}")
+    return low, high
+
+
 def _numeric_handler(
     function: Callable[[float, float], bool],
 ) -> Callable[[Any, Any], bool]:
@@ -107,57 +308,294 @@ OPERATOR_HANDLERS = {
     "not_in": _op_not_in,
     "contains": _op_contains,
     "not_contains": _op_not_contains,
+    "matches": _op_matches,
+    "not_matches": _op_not_matches,
+    "between": _op_between,
     **NUMERIC_HANDLERS,
 }
 
+# Operator preparers turn the YAML value into a faster representation once,
+# when the rules are compiled, instead of on every evaluation.
+OPERATOR_PREPARERS = {
+    "in": _prepare_membership,
+    "not_in": _prepare_membership,
+    "matches": _prepare_pattern,
+    "not_matches": _prepare_pattern,
+    "between": _prepare_range,
+}
+
+# Operators whose string values are literals, never references to other fields.
+LITERAL_OPERATORS = {"matches", "not_matches", "between"}
 
-def _apply_operator(actual: Any, operator: str, expected: Any) -> bool:
+# Quantifiers apply an operator across the values of a wildcard (or list) path.
+QUANTIFIERS = {"any", "all", "count"}
+
+
+def _cohort_handler(
+    score: str, function: Callable[[float, float], bool]
+) -> Callable[[Any, Any, Any], bool]:
     """
-    Apply an operator to two values.
+    Wrap a comparison of a value's cohort score (z-score or percentile of the
+    same gene metric across the cohort) against a numeric threshold.
     """
+
+    def handler(actual: Any, expected: Any, statistics: Any) -> bool:
+        actual = _coerce_numeric(actual)
+        if actual is None or statistics is None:
+            return False
+        value = getattr(statistics, score)(actual)
+        if value is None:
+            return False
+        return function(value, expected)
+
+    return handler
+
+
+# Cohort handlers also take the cohort statistics of the metric being compared.
+COHORT_HANDLERS = {
+    "zscore_gt": _cohort_handler("zscore", operator.gt),
+    "zscore_lt": _cohort_handler("zscore", operator.lt),
+    "percentile_gt": _cohort_handler("percentile", operator.gt),
+    "percentile_lt": _cohort_handler("percentile", operator.lt),
+}
+
+
+@dataclass(slots=True)
+class EvaluationContext:
+    """
+    State shared by all rule evaluations for one gene of one sample.
+
+    - gene: gene name in the sample, used to look up cohort statistics.
+    - cohort: optional cohort statistics (see paraphrase.cohort) for the
+      cohort-relative operators.
+    - values: resolved path values, so each path is walked once per gene.
+    - genes: all genes of the sample by lower-cased name, for '@GENE.path'.
+    - profiler: optional RuleProfiler (see paraphrase.profiling) that records
+      per-rule evaluation statistics; None skips all instrumentation.
+    """
+
+    gene: Optional[str] = None
+    cohort: Any = None
+    values: Dict[str, Any] = dataclass_field(default_factory=dict)
+    genes: Mapping[str, Any] = dataclass_field(default_factory=dict)
+    profiler: Any = None
+
+
+def _get_operator_handler(operator: str) -> Callable[[Any, Any], bool]:
     try:
-        handler = OPERATOR_HANDLERS[operator]
+        return OPERATOR_HANDLERS[operator]
     except KeyError:
         raise ValueError(f"Unsupported operator in rules: {operator}")
 
-    return handler(actual, expected)
 
+def _apply_operator(actual: Any, operator: str, expected: Any) -> bool:
+    """
+    Apply an operator to two values.
+    """
+    return _get_operator_handler(operator)(actual, expected)
 
-def _eval_leaf(gene_info: Dict[str, Any], leaf: Dict[str, Any]) -> bool:
+
+def _quantified_items(value: Any, path: FieldPath) -> List[Any]:
+    if path.wildcard:
+        return value
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+@dataclass(frozen=True)
+class CompiledLeaf:
     """
-    Leaf condition formats supported:
-    - { key: scalar } -> equality
-    - { key: {">=": 4} } -> single operator
+    A single `key: {op: value}` condition with its handler and value prepared.
     """
-    if len(leaf) != 1:
-        # Avoid ambiguous leaf dicts; require single key.
-        return False
 
-    key, spec = next(iter(leaf.items()))
-    actual = _get_path_value(gene_info, key)
+    path: str
+    operator: str
+    expected: Any
+    handler: Callable[[Any, Any], bool]
+    # Raw string value that may name another field (e.g. "<": genome_depth)
+    reference: Optional[str] = None
+    # One of QUANTIFIERS, or None for a plain single-value comparison
+    quantifier: Optional[str] = None
+    field: Optional[FieldPath] = None
+    # True for COHORT_HANDLERS, which compare against cohort statistics
+    cohort: bool = False
+    # Lower-cased gene read by '@GENE.path' keys and references, if not this one
+    gene: Optional[str] = None
+    reference_gene: Optional[str] = None
+
+    def evaluate(
+        self, gene_info: Dict[str, Any], context: Optional[EvaluationContext] = None
+    ) -> bool:
+        expected = self.expected
+        # Resolve field reference: if expected is a string that is a key in
+        # gene_info, compare against that field's value (e.g. "<": genome_depth).
+        if self.reference_gene is not None:
+            other = context.genes.get(self.reference_gene) if context else None
+            expected = _get_path_value(other, self.reference)
+        elif self.reference is not None and self.reference in gene_info:
+            expected = _get_path_value(gene_info, self.reference)
+
+        field = self.field or FieldPath.parse(self.path)
+        if self.gene is None:
+            actual = field.resolve(gene_info, context.values if context else None)
+        else:
+            actual = field.resolve(context.genes.get(self.gene) if context else None)
+
+        handler = self.handler
+        if self.cohort:
+            statistics = None
+            if context is not None and context.cohort is not None:
+                statistics = context.cohort.get(self.gene or context.gene, self.path)
+
+            def handler(actual: Any, expected: Any) -> bool:
+                return self.handler(actual, expected, statistics)
+
+        if self.quantifier is None:
+            return handler(actual, expected)
+
+        items = _quantified_items(actual, field)
+        if self.quantifier == "count":
+            return handler(len(items), expected)
+        if self.quantifier == "all":
+            # An empty set of values never satisfies 'all'
+            return bool(items) and all(handler(item, expected) for item in items)
+        return any(handler(item, expected) for item in items)
+
+    def prefetch(self, gene_info: Dict[str, Any], context: EvaluationContext) -> None:
+        """
+        Read the top-level fields this leaf depends on, so fields computed on
+        first access (see processors.GeneView) are not timed as part of
+        whichever rule happens to read them first.
+        """
+        field = self.field or FieldPath.parse(self.path)
+        target = gene_info if self.gene is None else context.genes.get(self.gene)
+        if field.segments[0] == WILDCARD:
+            _expand(target)
+        else:
+            _walk(target, field.segments[:1])
+        if self.reference is not None:
+            if self.reference_gene is not None:
+                target = context.genes.get(self.reference_gene)
+            else:
+                target = gene_info
+            _walk(target, (self.reference.split(".")[0],))
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    """
+    A compiled 'when' expression: the AND of its leaves.
+    """
 
+    leaves: Tuple[CompiledLeaf, ...] = ()
+    # False for unsupported expression structures, which never match
+    valid: bool = True
+
+    def evaluate(
+        self, gene_info: Dict[str, Any], context: Optional[EvaluationContext] = None
+    ) -> bool:
+        return self.valid and all(
+            leaf.evaluate(gene_info, context) for leaf in self.leaves
+        )
+
+    def evaluate_counted(
+        self, gene_info: Dict[str, Any], context: Optional[EvaluationContext] = None
+    ) -> Tuple[bool, int]:
+        """
+        Like evaluate, but also return how many leaves were evaluated before
+        the AND short-circuited, for profiling.
+        """
+        if not self.valid:
+            return False, 0
+        evaluated = 0
+        for leaf in self.leaves:
+            evaluated += 1
+            if not leaf.evaluate(gene_info, context):
+                return False, evaluated
+        return True, evaluated
+
+
+def _split_spec(key: str, spec: Any) -> Tuple[str, Any]:
+    """
+    Split a leaf spec into (operator, expected); a scalar means equality.
+    """
     if isinstance(spec, dict):
         # Exactly one operator per key to keep rules simple.
         if len(spec) != 1:
+            leaf = {key: spec}
             raise ValueError(
                 f"Multiple operators for the same key are not supported: {leaf!r}"
             )
-        op, expected = next(iter(spec.items()))
-        # Resolve field reference: if expected is a string that is a key in
-        # gene_info, compare against that field's value (e.g. "<": genome_depth).
-        if isinstance(expected, str) and expected in gene_info:
-            expected = _get_path_value(gene_info, expected)
-        return _apply_operator(actual, op, expected)
-    else:
-        expected = spec
-        if isinstance(expected, str) and expected in gene_info:
-            expected = _get_path_value(gene_info, expected)
-        return _apply_operator(actual, "==", expected)
+        return next(iter(spec.items()))
+    return "==", spec
 
 
-def eval_when(gene_info: Dict[str, Any], expression: Any) -> bool:
+def _compile_leaf(key: str, spec: Any) -> CompiledLeaf:
     """
-    Evaluate a 'when' expression.
+    Leaf condition formats supported:
+    - { key: scalar } -> equality
+    - { key: {">=": 4} } -> single operator
+    - { key.*.sub: {any|all: <scalar or {op: value}>} } -> quantified operator
+    - { key.*.sub: {count: <scalar or {op: value}>} } -> number of values
+
+    - { key: {zscore_gt: 3} } -> compare against cohort statistics of key
+    - { "@GENE.key": ... } or { key: {"<": "@GENE.key"} } -> another gene's field
+
+    Wildcard paths without a quantifier default to 'any'.
+    """
+    gene, path = _split_gene_path(key)
+    field = FieldPath.parse(path)
+    quantifier = "any" if field.wildcard else None
+    op, expected = _split_spec(key, spec)
+    if op in QUANTIFIERS:
+        quantifier = op
+        op, expected = _split_spec(key, expected)
+
+    if op in COHORT_HANDLERS:
+        threshold = _coerce_numeric(expected)
+        if threshold is None:
+            raise ValueError(f"'{op}' expects a numeric threshold, got: {expected!r}")
+        return CompiledLeaf(
+            path=path,
+            operator=op,
+            expected=threshold,
+            handler=COHORT_HANDLERS[op],
+            quantifier=quantifier,
+            field=field,
+            cohort=True,
+            gene=gene,
+        )
+
+    handler = _get_operator_handler(op)
+    reference = (
+        expected if isinstance(expected, str) and op not in LITERAL_OPERATORS else None
+    )
+    reference_gene = None
+    if reference is not None and reference.startswith(GENE_PREFIX):
+        reference_gene, reference = _split_gene_path(reference)
+    preparer = OPERATOR_PREPARERS.get(op)
+    if preparer is not None and reference is None:
+        expected = preparer(expected)
+
+    return CompiledLeaf(
+        path=path,
+        operator=op,
+        expected=expected,
+        handler=handler,
+        reference=reference,
+        quantifier=quantifier,
+        field=field,
+        gene=gene,
+        reference_gene=reference_gene,
+    )
+
+
+def compile_when(expression: Any) -> CompiledCondition:
+    """
+    Compile a 'when' expression.
 
     Supported form:
     - {key: value} or {key: {op: value}}
@@ -165,19 +603,259 @@ def eval_when(gene_info: Dict[str, Any], expression: Any) -> bool:
         {k1: 1, k2: {">=": 4}} means (k1 == 1 AND k2 >= 4).
     """
     if expression is None:
-        return True
+        return CompiledCondition()
 
     if isinstance(expression, dict):
-        # Multiple keys -> AND of leaves
-        if len(expression) > 1:
-            return all(
-                _eval_leaf(gene_info, {gene_metric_to_flag: gene_metric_value})
-                for gene_metric_to_flag, gene_metric_value in expression.items()
-            )
-        return _eval_leaf(gene_info, expression)
+        if not expression:
+            # An empty mapping never matches
+            return CompiledCondition(valid=False)
+        return CompiledCondition(
+            leaves=tuple(_compile_leaf(key, spec) for key, spec in expression.items())
+        )
 
     # Unknown structure
-    return False
+    return CompiledCondition(valid=False)
+
+
+def _eval_leaf(gene_info: Dict[str, Any], leaf: Dict[str, Any]) -> bool:
+    if len(leaf) != 1:
+        # Avoid ambiguous leaf dicts; require single key.
+        return False
+
+    key, spec = next(iter(leaf.items()))
+    return _compile_leaf(key, spec).evaluate(gene_info)
+
+
+def eval_when(gene_info: Dict[str, Any], expression: Any) -> bool:
+    """
+    Evaluate a 'when' expression (raw YAML or already compiled).
+    """
+    if not isinstance(expression, CompiledCondition):
+        expression = compile_when(expression)
+    return expression.evaluate(gene_info)
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    index: int
+    status: str
+    condition: CompiledCondition
+    rule: Dict[str, Any]  # original rule dict, kept for JSON output
+
+
+@dataclass(frozen=True)
+class GeneRules:
+    default_status: str
+    status_order: Tuple[str, ...]
+    rules: Tuple[CompiledRule, ...]
+    # The gene's original rule list, indexed by rule_index
+    source: Tuple[Dict[str, Any], ...] = ()
+    # Lower-cased genes whose status these rules read ('@GENE.status')
+    status_dependencies: FrozenSet[str] = frozenset()
+
+
+def _status_dependencies(rules: Tuple[CompiledRule, ...]) -> FrozenSet[str]:
+    dependencies = set()
+    for rule in rules:
+        for leaf in rule.condition.leaves:
+            if leaf.gene and leaf.path.split(".")[0] in STATUS_FIELDS:
+                dependencies.add(leaf.gene)
+            if leaf.reference_gene and leaf.reference.split(".")[0] in STATUS_FIELDS:
+                dependencies.add(leaf.reference_gene)
+    return frozenset(dependencies)
+
+
+def compile_gene_rules(gene_rules: Dict[str, Any]) -> GeneRules:
+    """
+    Compile one gene's rules block. Rules without a status are dropped, but the
+    remaining rules keep their original index.
+    """
+    rules = gene_rules.get("rules") or []
+    compiled = tuple(
+        CompiledRule(
+            index=idx,
+            status=rule["status"],
+            condition=compile_when(rule.get("when")),
+            rule=rule,
+        )
+        for idx, rule in enumerate(rules)
+        if rule.get("status")
+    )
+    return GeneRules(
+        default_status=gene_rules.get("default_status", "normal"),
+        status_order=tuple(
+            gene_rules.get("status_order") or ["normal", "intermediate", "pathological"]
+        ),
+        rules=compiled,
+        source=tuple(rules),
+        status_dependencies=_status_dependencies(compiled),
+    )
+
+
+def lookup_gene_rules(
+    gene: str, rules_yaml: Dict[str, Any]
+) -> Tuple[Optional[str], Any]:
+    """
+    Find a gene's rules block, returning (key in rules_yaml, rules block).
+
+    The lookup is case-insensitive (e.g. "f8" and "F8" match).
+    """
+    gene_rules = rules_yaml.get(gene)
+    if gene_rules:
+        return gene, gene_rules
+    if isinstance(rules_yaml, dict):
+        gene_lower = gene.lower()
+        for k, v in rules_yaml.items():
+            if isinstance(k, str) and k.lower() == gene_lower:
+                return k, v
+    return None, None
+
+
+def compile_rules(rules_yaml: Dict[str, Any]) -> Dict[str, GeneRules]:
+    """
+    Compile a rules YAML structure once, at load time.
+
+    Operator values are prepared up front (sets for `in`/`not_in`, compiled
+    regexes for `matches`/`not_matches`, numeric bounds for `between`), and
+    malformed conditions raise ValueError here rather than mid-run.
+
+    The result is ordered for evaluation: a gene comes after every gene whose
+    status its rules read, and cyclic status references raise ValueError.
+    """
+    return _in_dependency_order(
+        {
+            gene: gene_rules
+            if isinstance(gene_rules, GeneRules)
+            else compile_gene_rules(gene_rules)
+            for gene, gene_rules in rules_yaml.items()
+            if gene_rules
+        }
+    )
+
+
+def _in_dependency_order(rules: Dict[str, GeneRules]) -> Dict[str, GeneRules]:
+    """
+    Topologically order compiled rules by their status dependencies, keeping
+    the original order otherwise.
+    """
+    keys: Dict[str, str] = {}
+    for gene in rules:
+        keys.setdefault(gene.lower(), gene)
+
+    ordered: Dict[str, GeneRules] = {}
+    visiting: List[str] = []
+
+    def visit(gene: str) -> None:
+        if gene in ordered:
+            return
+        if gene in visiting:
+            cycle = " -> ".join(visiting[visiting.index(gene) :] + [gene])
+            raise ValueError(f"Cyclic cross-gene status references in rules: {cycle}")
+        visiting.append(gene)
+        for dependency in sorted(rules[gene].status_dependencies):
+            key = keys.get(dependency)
+            # Genes without rules have no status to wait for
+            if key is not None and key != gene:
+                visit(key)
+        visiting.pop()
+        ordered[gene] = rules[gene]
+
+    for gene in rules:
+        visit(gene)
+    return ordered
+
+
+def evaluation_order(genes: Iterable[str], rules_yaml: Dict[str, Any]) -> List[str]:
+    """
+    The sample genes that have rules, in the order their rules are evaluated.
+
+    This follows the dependency order computed by `compile_rules` (raw rules
+    are compiled first), so '@GENE.status' reads an already classified gene.
+    """
+    if not all(isinstance(gene_rules, GeneRules) for gene_rules in rules_yaml.values()):
+        rules_yaml = compile_rules(rules_yaml)
+    positions = {key: position for position, key in enumerate(rules_yaml)}
+    ranked = []
+    for gene in genes:
+        key, gene_rules = lookup_gene_rules(gene, rules_yaml)
+        if gene_rules:
+            ranked.append((positions[key], gene))
+    return [gene for _, gene in sorted(ranked, key=lambda item: item[0])]
+
+
+def referenced_genes(genes: Iterable[str], rules_yaml: Dict[str, Any]) -> Set[str]:
+    """
+    The lower-cased `genes` plus every gene their rules read through
+    '@GENE.path', followed transitively.
+    """
+    found = {gene.lower() for gene in genes}
+    pending = list(found)
+    while pending:
+        _, gene_rules = lookup_gene_rules(pending.pop(), rules_yaml)
+        if not gene_rules:
+            continue
+        if not isinstance(gene_rules, GeneRules):
+            gene_rules = compile_gene_rules(gene_rules)
+        for rule in gene_rules.rules:
+            for leaf in rule.condition.leaves:
+                for gene in (leaf.gene, leaf.reference_gene):
+                    if gene is not None and gene not in found:
+                        found.add(gene)
+                        pending.append(gene)
+    return found
+
+
+def cohort_metrics(rules: Dict[str, Any]) -> Set[Tuple[str, str]]:
+    """
+    (gene, path) pairs that cohort-relative operators need statistics for.
+    Gene names are lower-cased, matching the case-insensitive rule lookup.
+    """
+    metrics = set()
+    for gene, gene_rules in rules.items():
+        if not isinstance(gene_rules, GeneRules):
+            gene_rules = compile_gene_rules(gene_rules)
+        for rule in gene_rules.rules:
+            for leaf in rule.condition.leaves:
+                if leaf.cohort:
+                    metrics.add((leaf.gene or gene.lower(), leaf.path))
+    return metrics
+
+
+def rules_projection(
+    rules: Dict[str, Any],
+) -> Dict[str, Optional[FrozenSet[str]]]:
+    """
+    Top-level gene fields that the rules read, by lower-cased gene.
+
+    Covers each rules gene and every gene read through '@GENE.path'. None
+    means all fields (a path starting with a wildcard). Fields set by rule
+    evaluation (status, status_matches) are not included.
+    """
+    fields: Dict[str, Optional[Set[str]]] = {}
+
+    def add(gene: str, path: str, wildcard: bool = True) -> None:
+        head = path.split(".")[0]
+        gene_fields = fields.setdefault(gene, set())
+        if wildcard and head == WILDCARD:
+            fields[gene] = None
+        elif gene_fields is not None and head not in STATUS_FIELDS:
+            gene_fields.add(head)
+
+    for gene, gene_rules in rules.items():
+        if not isinstance(gene_rules, GeneRules):
+            gene_rules = compile_gene_rules(gene_rules)
+        gene = gene.lower()
+        fields.setdefault(gene, set())
+        for rule in gene_rules.rules:
+            for leaf in rule.condition.leaves:
+                add(leaf.gene or gene, leaf.path)
+                # References are plain paths; a literal value is harmless here
+                if leaf.reference is not None:
+                    add(leaf.reference_gene or gene, leaf.reference, wildcard=False)
+    return {
+        gene: None if gene_fields is None else frozenset(gene_fields)
+        for gene, gene_fields in fields.items()
+    }
 
 
 def _status_rank(status: str, status_order: Optional[List[str]]) -> int:
@@ -190,7 +868,12 @@ def _status_rank(status: str, status_order: Optional[List[str]]) -> int:
 
 
 def evaluate_gene_rules(
-    gene: str, gene_info: Dict[str, Any], rules_yaml: Dict[str, Any]
+    gene: str,
+    gene_info: Dict[str, Any],
+    rules_yaml: Dict[str, Any],
+    cohort: Any = None,
+    genes: Optional[Mapping[str, Any]] = None,
+    profiler: Any = None,
 ) -> Tuple[Optional[str], List[RuleMatch]]:
     """
     Evaluate rules for one gene and return (selected_status, matches).
@@ -209,43 +892,55 @@ def evaluate_gene_rules(
     "normal" and ["normal", "intermediate", "pathological"] respectively.
 
     Gene lookup in the rules YAML is case-insensitive (e.g. "f8" and "F8" match).
+    `rules_yaml` may be the raw YAML structure or the output of `compile_rules`.
+    `cohort` provides the statistics for cohort-relative operators (zscore_gt,
+    percentile_lt, ...); without it those conditions never match.
+    `genes` maps the sample's lower-cased gene names to their info, for
+    '@GENE.path' references; without it only the gene itself can be referenced.
+    `profiler` records evaluations, matches, leaf evaluations and time per
+    (rules gene, rule_index); the fields the rules read are computed before
+    timing starts.
     """
-    gene_rules = rules_yaml.get(gene)
-    if not gene_rules and isinstance(rules_yaml, dict):
-        gene_lower = gene.lower()
-        for k, v in rules_yaml.items():
-            if isinstance(k, str) and k.lower() == gene_lower:
-                gene_rules = v
-                break
+    rules_gene, gene_rules = lookup_gene_rules(gene, rules_yaml)
     if not gene_rules:
         return None, []
-
-    rules = gene_rules.get("rules") or []
-    default_status = gene_rules.get("default_status", "normal")
-    status_order = gene_rules.get("status_order") or [
-        "normal",
-        "intermediate",
-        "pathological",
-    ]
+    if not isinstance(gene_rules, GeneRules):
+        gene_rules = compile_gene_rules(gene_rules)
+
+    # Shared by all rules of this gene; each path is walked once
+    if genes is None:
+        genes = {gene.lower(): gene_info}
+    context = EvaluationContext(
+        gene=gene, cohort=cohort, genes=genes, profiler=profiler
+    )
+    if profiler is not None:
+        # Compute lazily derived fields up front, outside the per-rule timings
+        for rule in gene_rules.rules:
+            for leaf in rule.condition.leaves:
+                leaf.prefetch(gene_info, context)
 
     matches: List[RuleMatch] = []
-    for idx, rule in enumerate(rules):
-        status = rule.get("status")
-        when = rule.get("when")
-        if not status:
-            continue
-        if eval_when(gene_info, when):
+    for rule in gene_rules.rules:
+        if profiler is None:
+            matched = rule.condition.evaluate(gene_info, context)
+        else:
+            start = time.perf_counter()
+            matched, leaves = rule.condition.evaluate_counted(gene_info, context)
+            elapsed = time.perf_counter() - start
+            profiler.record(rules_gene, rule.index, matched, leaves, elapsed)
+        if matched:
             matches.append(
                 RuleMatch(
-                    status=status,
-                    rule_index=idx,
-                    rule=dict(rule),  # copy for JSON output
+                    status=rule.status,
+                    rule_index=rule.index,
+                    rule=dict(rule.rule),  # copy for JSON output
                 )
             )
 
     if not matches:
-        return default_status, []
+        return gene_rules.default_status, []
 
     # Choose best match based on canonical severity order.
+    status_order = list(gene_rules.status_order)
     selected = max(matches, key=lambda m: _status_rank(m.status, status_order))
     return selected.status, matches
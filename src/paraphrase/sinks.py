@@ -0,0 +1,280 @@
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO
+
+from .io import (
+    COMPACT_FORMAT,
+    COMPACT_SEPARATORS,
+    COMPACT_VERSION,
+    STATUS_TSV_HEADER,
+    TSV_HEADER,
+    compact_rule_table,
+    compact_sample,
+    json_default,
+    status_rows,
+    tsv_rows,
+)
+from .cohort import CohortStatistics
+from .index import SampleIndex, index_path
+from .processors import freeze_sample
+from .summary import CohortSummary
+
+STDOUT = "-"
+
+
+class Sink:
+    """
+    Output destination that receives each processed sample as it is produced.
+
+    Subclasses write a header in `open`, one record per `write_sample` call and
+    any trailer in `close`, so all outputs are produced in a single pass.
+
+    Sinks with a `format_name` can also write a companion offset index
+    (`<path>.idx`) for random access to single samples; see paraphrase.index.
+    """
+
+    # Output format recorded in the index; None if the sink cannot be indexed
+    format_name: Optional[str] = None
+    # True if the sink keeps samples in memory (input strings are then pooled)
+    retains_samples: bool = False
+    # True if the sink reads every field of each sample; otherwise fields it
+    # does not read are never handled
+    reads_all_fields: bool = False
+
+    def __init__(self, path: str = STDOUT):
+        self.path = path
+        self._stream: Optional[TextIO] = None
+        self.index: Optional[SampleIndex] = None
+        self.offset = 0
+
+    @property
+    def stream(self) -> TextIO:
+        if self._stream is None:
+            if self.path == STDOUT:
+                self._stream = sys.stdout
+            else:
+                self._stream = Path(self.path).open("w", encoding="utf-8")
+        return self._stream
+
+    def enable_index(self) -> None:
+        if self.format_name is None:
+            raise ValueError(f"{type(self).__name__} outputs cannot be indexed")
+        if self.path == STDOUT:
+            raise ValueError("Outputs written to stdout cannot be indexed")
+        self.index = SampleIndex(self.format_name)
+
+    def write(self, text: str) -> None:
+        """Write to the stream, tracking the byte offset when indexing."""
+        self.stream.write(text)
+        if self.index is not None:
+            self.offset += len(text.encode("utf-8"))
+
+    def write_record(self, sample: str, text: str) -> None:
+        """Write one sample's record, adding its byte span to the index."""
+        start = self.offset
+        self.write(text)
+        if self.index is not None:
+            self.index.add(sample, start, self.offset - start)
+
+    def open(self) -> None:
+        pass
+
+    def write_sample(self, sample: str, data: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        if self._stream is not None and self.path != STDOUT:
+            self._stream.close()
+        self._stream = None
+        if self.index is not None:
+            self.index.save(index_path(Path(self.path)))
+
+
+class JSONSink(Sink):
+    """
+    Streams {sample: data} as indented JSON, identical to json.dumps(indent=2).
+    """
+
+    format_name = "json"
+    reads_all_fields = True
+
+    def __init__(self, path: str = STDOUT):
+        super().__init__(path)
+        self._samples = 0
+
+    def write_sample(self, sample: str, data: Dict[str, Any]) -> None:
+        body = json.dumps(data, indent=2, default=json_default).replace("\n", "\n  ")
+        prefix = "{\n" if self._samples == 0 else ",\n"
+        self.write(f"{prefix}  {json.dumps(sample)}: ")
+        self.write_record(sample, body)
+        self._samples += 1
+
+    def close(self) -> None:
+        self.write("{}\n" if self._samples == 0 else "\n}\n")
+        super().close()
+
+
+class CompactJSONSink(Sink):
+    """
+    Streams the compact format: a rule table header, then one line per sample.
+    """
+
+    format_name = "compact"
+    reads_all_fields = True
+
+    def __init__(self, path: str = STDOUT, rules: Optional[Dict[str, Any]] = None):
+        super().__init__(path)
+        self.rules = rules
+        self._samples = 0
+
+    def _dumps(self, value: Any) -> str:
+        return json.dumps(value, separators=COMPACT_SEPARATORS, default=json_default)
+
+    def open(self) -> None:
+        self.write(
+            f'{{"format":{self._dumps(COMPACT_FORMAT)},'
+            f'"version":{COMPACT_VERSION},'
+            '"rules":'
+        )
+        start = self.offset
+        self.write(self._dumps(compact_rule_table(self.rules)))
+        if self.index is not None:
+            self.index.header = (start, self.offset - start)
+        self.write(',"samples":{')
+
+    def write_sample(self, sample: str, data: Dict[str, Any]) -> None:
+        prefix = "" if self._samples == 0 else ","
+        self.write(f"{prefix}{self._dumps(sample)}:")
+        self.write_record(sample, self._dumps(compact_sample(data, self.rules)))
+        self._samples += 1
+
+    def close(self) -> None:
+        self.write("}}\n")
+        super().close()
+
+
+class TSVSink(Sink):
+    format_name = "tsv"
+    reads_all_fields = True
+
+    def open(self) -> None:
+        self.write(TSV_HEADER + "\n")
+
+    def write_sample(self, sample: str, data: Dict[str, Any]) -> None:
+        self.write_record(sample, "".join(row + "\n" for row in tsv_rows(sample, data)))
+
+
+class StatusSink(Sink):
+    """
+    Writes only the per-gene status as sample/gene/status TSV rows.
+    """
+
+    format_name = "status"
+
+    def open(self) -> None:
+        self.write(STATUS_TSV_HEADER + "\n")
+
+    def write_sample(self, sample: str, data: Dict[str, Any]) -> None:
+        self.write_record(
+            sample, "".join(row + "\n" for row in status_rows(sample, data))
+        )
+
+
+class SummarySink(Sink):
+    """
+    Collects per-gene cohort statistics and writes them as JSON on close.
+    """
+
+    def __init__(self, path: str = STDOUT):
+        super().__init__(path)
+        self.summary = CohortSummary()
+
+    def write_sample(self, sample: str, data: Dict[str, Any]) -> None:
+        self.summary.add_sample(data)
+
+    def close(self) -> None:
+        json.dump(self.summary.to_dict(), self.stream, indent=2)
+        self.stream.write("\n")
+        super().close()
+
+
+class CohortStatsSink(Sink):
+    """
+    Collects reference cohort statistics for every numeric gene metric and
+    writes them as JSON on close, for use with --cohort-stats in later runs.
+    """
+
+    reads_all_fields = True
+
+    def __init__(self, path: str = STDOUT):
+        super().__init__(path)
+        self.cohort = CohortStatistics()
+
+    def write_sample(self, sample: str, data: Dict[str, Any]) -> None:
+        self.cohort.add_sample(data)
+
+    def close(self) -> None:
+        json.dump(self.cohort.to_dict(), self.stream)
+        self.stream.write("\n")
+        super().close()
+
+
+class MemorySink(Sink):
+    """
+    Keeps {sample: data} in memory, e.g. for library use and tests.
+
+    Samples are stored as compact GeneRecords, which also releases the raw
+    parsed JSON behind each lazy gene view.
+    """
+
+    retains_samples = True
+    reads_all_fields = True
+
+    def __init__(self):
+        super().__init__()
+        self.data: Dict[str, Dict[str, Any]] = {}
+
+    def write_sample(self, sample: str, data: Dict[str, Any]) -> None:
+        self.data[sample] = freeze_sample(data)
+
+    def close(self) -> None:
+        pass
+
+
+SINK_FORMATS = {
+    "json": JSONSink,
+    "compact": CompactJSONSink,
+    "tsv": TSVSink,
+    "status": StatusSink,
+    "summary": SummarySink,
+    "cohort-stats": CohortStatsSink,
+}
+
+
+def create_sink(
+    output_format: str, path: str = STDOUT, rules: Optional[Dict[str, Any]] = None
+) -> Sink:
+    output_format = output_format.lower()
+    if output_format not in SINK_FORMATS:
+        raise ValueError(
+            f"Unknown output format '{output_format}'. "
+            f"Choose from: {', '.join(SINK_FORMATS)}"
+        )
+    if output_format == "compact":
+        return CompactJSONSink(path, rules=rules)
+    return SINK_FORMATS[output_format](path)
+
+
+def parse_sink_spec(spec: str, rules: Optional[Dict[str, Any]] = None) -> Sink:
+    """
+    Create a sink from a 'format:path' spec, e.g. 'tsv:cohort.tsv'.
+    A missing path or '-' writes to stdout.
+    """
+    output_format, _, path = spec.partition(":")
+    return create_sink(output_format, path or STDOUT, rules)
+
+
+def check_single_stdout(sinks: List[Sink]) -> None:
+    if sum(sink.path == STDOUT for sink in sinks) > 1:
+        raise ValueError("At most one output can be written to stdout")
@@ -0,0 +1,130 @@
+import threading
+from queue import Full, Queue
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+# Default number of items buffered between two stages
+DEFAULT_QUEUE_DEPTH = 4
+
+_END = object()
+
+
+class _Failure:
+    """An exception passed from a stage thread to the consumer."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _put(queue: Queue, item: Any, stop: threading.Event) -> bool:
+    """
+    Put with backpressure, giving up once `stop` is set (i.e. the other side
+    of the queue is gone). Returns whether the item was queued.
+    """
+    while not stop.is_set():
+        try:
+            queue.put(item, timeout=0.1)
+            return True
+        except Full:
+            continue
+    return False
+
+
+def read_ahead(items: Iterable[Any], depth: int = DEFAULT_QUEUE_DEPTH) -> Iterator[Any]:
+    """
+    Iterate `items` on a background thread, keeping up to `depth` of them
+    ready, so I/O done while producing the next item overlaps with the
+    consumer's work on the current one. Order is preserved and exceptions
+    raised by `items` are re-raised in the consumer.
+
+    With `depth` 0 items are produced inline. Close the returned generator
+    (e.g. with contextlib.closing) to stop the thread early.
+    """
+    if depth <= 0:
+        yield from items
+        return
+
+    queue: Queue = Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not _put(queue, item, stop):
+                    return
+        except BaseException as e:
+            _put(queue, _Failure(e), stop)
+            return
+        _put(queue, _END, stop)
+
+    thread = threading.Thread(target=produce, name="paraphrase-reader", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = queue.get()
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+class BackgroundWriter:
+    """
+    Applies `write` to submitted items, in order, on a background thread.
+
+    Up to `depth` items wait in the queue; `submit` blocks when it is full.
+    An exception raised by `write` stops the writer and is re-raised by the
+    next `submit` or by `close`, which also waits for pending items. With
+    `depth` 0 items are written inline.
+    """
+
+    def __init__(self, write: Callable[[Any], None], depth: int = DEFAULT_QUEUE_DEPTH):
+        self.write = write
+        self.depth = depth
+        self._error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+        if depth > 0:
+            self._queue: Queue = Queue(maxsize=depth)
+            self._stop = threading.Event()
+            self._thread = threading.Thread(
+                target=self._consume, name="paraphrase-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _consume(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _END:
+                return
+            try:
+                self.write(item)
+            except BaseException as e:
+                self._error = e
+                self._stop.set()
+                return
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def submit(self, item: Any) -> None:
+        if self._thread is None:
+            self.write(item)
+            return
+        self._raise_error()
+        if not _put(self._queue, item, self._stop):
+            self._raise_error()
+
+    def close(self) -> None:
+        """Wait for all submitted items to be written."""
+        if self._thread is None:
+            return
+        _put(self._queue, _END, self._stop)
+        self._thread.join()
+        self._thread = None
+        self._raise_error()
@@ -0,0 +1,295 @@
+import math
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional
+
+COPY_NUMBER_METRICS = ("gene_cn", "smn1_cn", "total_cn")
+DEPTH_METRIC = "region_depth"
+SUMMARY_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded relative error (DDSketch-style).
+
+    Values are counted in logarithmically sized buckets, so memory depends on
+    the spread of the values rather than on how many were added. Two sketches
+    with the same accuracy can be merged by adding their bucket counts, which
+    makes it possible to summarise shards separately and combine them later.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive: Dict[int, int] = {}
+        self._negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, index: int) -> float:
+        return 2 * self._gamma**index / (self._gamma + 1)
+
+    def add(self, value: float) -> None:
+        value = float(value)
+        if value > 0:
+            store = self._positive
+            index = self._index(value)
+        elif value < 0:
+            store = self._negative
+            index = self._index(-value)
+        else:
+            store = None
+            self.zero_count += 1
+
+        if store is not None:
+            store[index] = store.get(index, 0) + 1
+            if len(store) > self.max_buckets:
+                self._collapse(store)
+
+        self.count += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def _collapse(self, store: Dict[int, int]) -> None:
+        """
+        Fold the lowest buckets into one so the store never exceeds max_buckets.
+        """
+        indices = sorted(store)
+        excess = indices[: len(indices) - self.max_buckets + 1]
+        target = indices[len(excess)]
+        store[target] += sum(store.pop(index) for index in excess)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Add the counts of another sketch to this one.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracies")
+        for own, theirs in (
+            (self._positive, other._positive),
+            (self._negative, other._negative),
+        ):
+            for index, count in theirs.items():
+                own[index] = own.get(index, 0) + count
+            if len(own) > self.max_buckets:
+                self._collapse(own)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        for bound in (other.min, other.max):
+            if bound is None:
+                continue
+            self.min = bound if self.min is None else min(self.min, bound)
+            self.max = bound if self.max is None else max(self.max, bound)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Return the approximate q-quantile (0 <= q <= 1), or None if empty.
+        """
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self._negative, reverse=True):
+            seen += self._negative[index]
+            if seen > rank:
+                return -self._value(index)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self._positive):
+            seen += self._positive[index]
+            if seen > rank:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    def rank(self, value: float) -> Optional[float]:
+        """
+        Approximate fraction of values less than or equal to value, or None if empty.
+        """
+        if self.count == 0:
+            return None
+        value = float(value)
+        if value >= self.max:
+            return 1.0
+        if value < self.min:
+            return 0.0
+
+        if value < 0:
+            index = self._index(-value)
+            seen = sum(c for i, c in self._negative.items() if i >= index)
+        else:
+            seen = sum(self._negative.values()) + self.zero_count
+            if value > 0:
+                index = self._index(value)
+                seen += sum(c for i, c in self._positive.items() if i <= index)
+        return seen / self.count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "zero_count": self.zero_count,
+            "positive": {str(k): v for k, v in sorted(self._positive.items())},
+            "negative": {str(k): v for k, v in sorted(self._negative.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(relative_accuracy=data["relative_accuracy"])
+        sketch.count = data["count"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        sketch.zero_count = data["zero_count"]
+        sketch._positive = {int(k): v for k, v in data["positive"].items()}
+        sketch._negative = {int(k): v for k, v in data["negative"].items()}
+        return sketch
+
+
+def _copy_number_key(value: Any) -> Optional[str]:
+    """
+    Normalise a copy-number value to a string key, e.g. 2 and 2.0 -> "2".
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def _sort_numeric_keys(counts: Dict[str, int]) -> Dict[str, int]:
+    return dict(sorted(counts.items(), key=lambda item: float(item[0])))
+
+
+class GeneSummary:
+    """
+    Running statistics for one gene across all samples seen so far.
+    """
+
+    def __init__(self):
+        self.samples = 0
+        self.status_counts: Counter = Counter()
+        self.copy_numbers: Dict[str, Counter] = {
+            metric: Counter() for metric in COPY_NUMBER_METRICS
+        }
+        self.region_depth = QuantileSketch()
+
+    def add(self, gene_info: Dict[str, Any]) -> None:
+        self.samples += 1
+
+        status = gene_info.get("status")
+        self.status_counts[status if isinstance(status, str) else "unknown"] += 1
+
+        for metric in COPY_NUMBER_METRICS:
+            key = _copy_number_key(gene_info.get(metric))
+            if key is not None:
+                self.copy_numbers[metric][key] += 1
+
+        depth = gene_info.get(DEPTH_METRIC)
+        if isinstance(depth, (int, float)) and not isinstance(depth, bool):
+            self.region_depth.add(depth)
+
+    def merge(self, other: "GeneSummary") -> None:
+        self.samples += other.samples
+        self.status_counts.update(other.status_counts)
+        for metric, counts in other.copy_numbers.items():
+            self.copy_numbers.setdefault(metric, Counter()).update(counts)
+        self.region_depth.merge(other.region_depth)
+
+    def to_dict(self) -> Dict[str, Any]:
+        depth = self.region_depth
+        return {
+            "samples": self.samples,
+            "status_counts": dict(sorted(self.status_counts.items())),
+            "copy_numbers": {
+                metric: _sort_numeric_keys(counts)
+                for metric, counts in self.copy_numbers.items()
+                if counts
+            },
+            DEPTH_METRIC: {
+                "count": depth.count,
+                "min": depth.min,
+                "max": depth.max,
+                "quantiles": {str(q): depth.quantile(q) for q in SUMMARY_QUANTILES},
+                "sketch": depth.to_dict(),
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GeneSummary":
+        summary = cls()
+        summary.samples = data["samples"]
+        summary.status_counts = Counter(data["status_counts"])
+        for metric, counts in data["copy_numbers"].items():
+            summary.copy_numbers[metric] = Counter(counts)
+        summary.region_depth = QuantileSketch.from_dict(data[DEPTH_METRIC]["sketch"])
+        return summary
+
+
+class CohortSummary:
+    """
+    Per-gene cohort overview collected in a single pass over processed samples.
+
+    Call `add_sample` with each processed sample as it is produced. Summaries of
+    separate shards can be combined with `merge` (or `merge_summaries`).
+    """
+
+    def __init__(self):
+        self.samples = 0
+        self.genes: Dict[str, GeneSummary] = {}
+
+    def add_sample(self, processed: Dict[str, Dict[str, Any]]) -> None:
+        self.samples += 1
+        for gene, gene_info in processed.items():
+            gene_summary = self.genes.get(gene)
+            if gene_summary is None:
+                gene_summary = self.genes[gene] = GeneSummary()
+            gene_summary.add(gene_info)
+
+    def merge(self, other: "CohortSummary") -> None:
+        self.samples += other.samples
+        for gene, gene_summary in other.genes.items():
+            if gene in self.genes:
+                self.genes[gene].merge(gene_summary)
+            else:
+                self.genes[gene] = GeneSummary.from_dict(gene_summary.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "samples": self.samples,
+            "genes": {gene: summary.to_dict() for gene, summary in self.genes.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CohortSummary":
+        summary = cls()
+        summary.samples = data["samples"]
+        summary.genes = {
+            gene: GeneSummary.from_dict(gene_data)
+            for gene, gene_data in data["genes"].items()
+        }
+        return summary
+
+
+def merge_summaries(summaries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine serialized shard summaries (as written by --summary) into one.
+    """
+    combined = CohortSummary()
+    for data in summaries:
+        combined.merge(CohortSummary.from_dict(data))
+    return combined.to_dict()
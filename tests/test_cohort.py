@@ -0,0 +1,129 @@
+import json
+
+import pytest
+
+from paraphrase.cohort import CohortStatistics, MetricStatistics
+from paraphrase.config import ProcessingConfig
+from paraphrase.pipeline import collect_cohort_statistics
+from paraphrase.rules_engine import cohort_metrics, compile_rules, evaluate_gene_rules
+from paraphrase.sinks import CohortStatsSink
+
+RULES = compile_rules(
+    {
+        "smn1": {
+            "rules": [
+                {"status": "intermediate", "when": {"depth": {"zscore_lt": -1.5}}},
+                {"status": "pathological", "when": {"depth": {"percentile_gt": 95}}},
+            ]
+        }
+    }
+)
+
+
+def _cohort(values):
+    cohort = CohortStatistics()
+    for value in values:
+        cohort.add_sample({"SMN1": {"depth": value, "name": "x"}})
+    return cohort
+
+
+def test_metric_statistics_merge_matches_single_pass():
+    values = [10.0, 12.0, 14.0, 30.0, 31.0]
+    whole = MetricStatistics()
+    left, right = MetricStatistics(), MetricStatistics()
+    for i, value in enumerate(values):
+        whole.add(value)
+        (left if i < 2 else right).add(value)
+    left.merge(right)
+    assert left.count == whole.count
+    assert left.mean == pytest.approx(whole.mean)
+    assert left.std == pytest.approx(whole.std)
+
+
+def test_zscore_and_percentile_rules():
+    cohort = _cohort([40, 42, 44, 46, 48] * 4)
+    assert cohort.get("smn1", "depth").count == 20
+    assert cohort_metrics(RULES) == {("smn1", "depth")}
+
+    status, _ = evaluate_gene_rules("SMN1", {"depth": 30}, RULES, cohort=cohort)
+    assert status == "intermediate"
+    status, _ = evaluate_gene_rules("SMN1", {"depth": 60}, RULES, cohort=cohort)
+    assert status == "pathological"
+    status, _ = evaluate_gene_rules("SMN1", {"depth": 44}, RULES, cohort=cohort)
+    assert status == "normal"
+
+
+def test_cohort_rules_do_not_match_without_statistics():
+    status, _ = evaluate_gene_rules("SMN1", {"depth": 0}, RULES)
+    assert status == "normal"
+    # Zero variance: no z-score
+    cohort = _cohort([44, 44, 44])
+    status, _ = evaluate_gene_rules("SMN1", {"depth": 0}, RULES, cohort=cohort)
+    assert status == "normal"
+
+
+def test_cohort_threshold_must_be_numeric():
+    with pytest.raises(ValueError):
+        compile_rules(
+            {
+                "smn1": {
+                    "rules": [{"status": "x", "when": {"depth": {"zscore_gt": "y"}}}]
+                }
+            }
+        )
+
+
+def test_cohort_stats_sink_round_trip(tmp_path):
+    path = tmp_path / "reference.json"
+    sink = CohortStatsSink(str(path))
+    for value in [40, 44, 48]:
+        sink.write_sample("S", {"SMN1": {"depth": value}})
+    sink.close()
+
+    reference = CohortStatistics.load(path)
+    assert reference.samples == 3
+    statistics = reference.get("SMN1", "depth")
+    assert statistics.mean == pytest.approx(44)
+    assert statistics.zscore(48) == pytest.approx(1)
+
+
+def test_collect_cohort_statistics_first_pass(tmp_path):
+    files = []
+    for i, depth in enumerate([40, 44, 48]):
+        file = tmp_path / f"s{i}.json"
+        file.write_text(json.dumps({"smn1": {"depth": depth, "other": 1}}))
+        files.append(file)
+    config = ProcessingConfig(skip_keys=set(), rules=RULES)
+    cohort = collect_cohort_statistics(
+        files, ["S0", "S1", "S2"], config, cohort_metrics(RULES)
+    )
+    assert set(cohort.metrics) == {("smn1", "depth")}
+    assert cohort.get("smn1", "depth").count == 3
+
+
+def test_collect_cohort_statistics_keeps_genes_read_by_cross_gene_rules(tmp_path):
+    rules = compile_rules(
+        {
+            "cfh": {
+                "rules": [
+                    {
+                        "status": "pathological",
+                        "when": {"@cfhr3.depth": {"zscore_gt": 1}},
+                    }
+                ]
+            }
+        }
+    )
+    files = []
+    for i, depth in enumerate([40, 41, 39, 40, 80]):
+        file = tmp_path / f"s{i}.json"
+        file.write_text(json.dumps({"CFH": {"depth": 40}, "CFHR3": {"depth": depth}}))
+        files.append(file)
+    config = ProcessingConfig(skip_keys=set(), genes_list=["cfh"], rules=rules)
+    metrics = cohort_metrics(rules)
+    assert metrics == {("cfhr3", "depth")}
+
+    cohort = collect_cohort_statistics(
+        files, [f"S{i}" for i in range(5)], config, metrics, read_queue=0
+    )
+    assert cohort.get("cfhr3", "depth").count == 5
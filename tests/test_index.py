@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from paraphrase.index import SampleIndex, index_path, read_sample, read_samples
+from paraphrase.rules_engine import compile_rules
+from paraphrase.sinks import create_sink
+
+RULES = compile_rules(
+    {"smn1": {"rules": [{"status": "pathological", "when": {"smn1_cn": 0}}]}}
+)
+SAMPLES = {
+    "S1": {"smn1": {"smn1_cn": 0, "status": "pathological", "note": "ünïcode"}},
+    "S2": {"smn1": {"smn1_cn": 2, "status": "normal"}},
+}
+
+
+def _write(output_format, path):
+    sink = create_sink(output_format, str(path), rules=RULES)
+    sink.enable_index()
+    sink.open()
+    for sample, data in SAMPLES.items():
+        sink.write_sample(sample, data)
+    sink.close()
+    return sink
+
+
+def test_json_index_reads_single_sample(tmp_path):
+    output = tmp_path / "cohort.json"
+    _write("json", output)
+    assert index_path(output).name == "cohort.json.idx"
+    # Indexing does not change the output
+    assert json.loads(output.read_text()) == SAMPLES
+    assert read_sample(output, "S2") == SAMPLES["S2"]
+    assert read_samples(output, ["S1", "S2"]) == SAMPLES
+    with pytest.raises(KeyError):
+        read_sample(output, "S3")
+
+
+def test_compact_index_expands_rule_references(tmp_path):
+    output = tmp_path / "cohort.compact.json"
+    sink = create_sink("compact", str(output), rules=RULES)
+    sink.enable_index()
+    sink.open()
+    sink.write_sample(
+        "S1",
+        {
+            "smn1": {
+                "status": "pathological",
+                "status_matches": [{"rule_index": 0}],
+            }
+        },
+    )
+    sink.close()
+    match = read_sample(output, "S1")["smn1"]["status_matches"][0]
+    assert match["rule_index"] == 0
+    assert match["status"] == "pathological"
+
+
+def test_tsv_index_reads_rows(tmp_path):
+    output = tmp_path / "cohort.tsv"
+    _write("tsv", output)
+    rows = read_sample(output, "S1")
+    assert [row["metric"] for row in rows] == ["smn1_cn", "note"]
+    assert rows[1]["value"] == "ünïcode"
+    assert SampleIndex.load(index_path(output)).output_format == "tsv"
+
+
+def test_stdout_and_summary_outputs_cannot_be_indexed():
+    with pytest.raises(ValueError):
+        create_sink("json").enable_index()
+    with pytest.raises(ValueError):
+        create_sink("summary", "summary.json").enable_index()
@@ -0,0 +1,70 @@
+import json
+
+from paraphrase.io import load_compact_json
+from paraphrase.rules_engine import compile_rules
+from paraphrase.sinks import CompactJSONSink
+
+RULES = compile_rules(
+    {
+        "SMN1": {
+            "rules": [
+                {"status": "intermediate", "when": {"smn2_cn": {">=": 4}}},
+                {
+                    "status": "pathological",
+                    "when": {"smn1_cn": {"<": 1}},
+                    "reason": "SMN1 copy number is less than 1",
+                },
+            ]
+        }
+    }
+)
+
+RULE = {
+    "status": "pathological",
+    "when": {"smn1_cn": {"<": 1}},
+    "reason": "SMN1 copy number is less than 1",
+}
+
+JSON_DATA = {
+    "S1": {
+        "smn1": {
+            "smn1_cn": 0,
+            "status": "pathological",
+            "status_matches": [
+                {
+                    "status": "pathological",
+                    "rule_index": 1,
+                    "reason": "SMN1 copy number is less than 1",
+                    "rule": RULE,
+                }
+            ],
+        },
+        "CFH": {"region_depth": 41.0},
+    }
+}
+
+
+def _write_compact(path):
+    sink = CompactJSONSink(str(path), rules=RULES)
+    sink.open()
+    for sample, sample_data in JSON_DATA.items():
+        sink.write_sample(sample, sample_data)
+    sink.close()
+
+
+def test_compact_references_rules_by_gene_and_index(tmp_path):
+    path = tmp_path / "out.compact.json"
+    _write_compact(path)
+    compact = json.loads(path.read_text())
+
+    assert compact["rules"]["SMN1"][1] == RULE
+    assert compact["samples"]["S1"]["smn1"]["status_matches"] == [["SMN1", 1]]
+    assert compact["samples"]["S1"]["CFH"] == {"region_depth": 41.0}
+
+
+def test_compact_round_trip_restores_full_output(tmp_path):
+    path = tmp_path / "out.compact.json"
+    _write_compact(path)
+
+    assert len(path.read_text().splitlines()) == 1
+    assert load_compact_json(path) == JSON_DATA
@@ -0,0 +1,42 @@
+import json
+
+from paraphrase.io import StringPool, load_json
+
+
+def test_load_json_shares_repeated_strings_across_files(tmp_path):
+    sample = {"smn1": {"final_haplotypes": {"x1": "smn1_smn1hap1"}, "gene_cn": 2}}
+    first = tmp_path / "S1.json"
+    second = tmp_path / "S2.json"
+    first.write_text(json.dumps(sample))
+    second.write_text(json.dumps(sample))
+
+    pool = StringPool()
+    a = load_json(first, pool=pool)
+    b = load_json(second, pool=pool)
+
+    assert a == b == sample
+    key_a = next(iter(a["smn1"]))
+    key_b = next(iter(b["smn1"]))
+    assert key_a is key_b
+    assert a["smn1"]["final_haplotypes"]["x1"] is b["smn1"]["final_haplotypes"]["x1"]
+
+
+def test_load_json_does_not_pool_by_default(tmp_path):
+    sample = {"smn1": {"gene_cn": 2}}
+    first = tmp_path / "S1.json"
+    second = tmp_path / "S2.json"
+    first.write_text(json.dumps(sample))
+    second.write_text(json.dumps(sample))
+    key_a = next(iter(load_json(first)["smn1"]))
+    key_b = next(iter(load_json(second)["smn1"]))
+    assert key_a == key_b and key_a is not key_b
+
+
+def test_string_pool_skips_long_strings_and_stops_growing():
+    pool = StringPool(max_length=5, max_size=1)
+    long_value = "".join(["1"] * 10)
+    assert pool(long_value) is long_value
+    assert pool("smn1") == "smn1"
+    assert len(pool._strings) == 1
+    pool("gba")
+    assert len(pool._strings) == 1
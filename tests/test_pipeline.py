@@ -0,0 +1,192 @@
+import json
+
+import pytest
+
+from paraphrase.checkpoint import Checkpoint, config_fingerprint
+from paraphrase.config import ProcessingConfig
+from paraphrase.exceptions import (
+    CheckpointMismatchError,
+    InputMismatchError,
+    JSONLoadError,
+)
+from paraphrase.pipeline import (
+    assert_equal_inputs_and_samples,
+    process_samples,
+    write_error_report,
+)
+from paraphrase.sinks import JSONSink, MemorySink, StatusSink
+
+SAMPLE = {"smn1": {"region_depth": {"median": 44.0}, "smn1_cn": 2}}
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    good = tmp_path / "good.json"
+    good.write_text(json.dumps(SAMPLE))
+    bad = tmp_path / "bad.json"
+    bad.write_text("{not json")
+    return good, bad
+
+
+def test_process_samples_aborts_on_error_by_default(inputs):
+    good, bad = inputs
+    with pytest.raises(JSONLoadError):
+        process_samples(
+            [good, bad], ["S1", "S2"], ProcessingConfig(skip_keys=set()), []
+        )
+
+
+@pytest.mark.parametrize("queue_depth", [0, 1])
+def test_aborted_run_closes_sinks(inputs, tmp_path, queue_depth):
+    good, bad = inputs
+    output = tmp_path / "out.json"
+    with pytest.raises(JSONLoadError):
+        process_samples(
+            [good, bad],
+            ["S1", "S2"],
+            ProcessingConfig(skip_keys=set()),
+            [JSONSink(str(output))],
+            read_queue=queue_depth,
+            write_queue=queue_depth,
+        )
+    # Samples completed before the failure form a well-formed output
+    assert list(json.loads(output.read_text())) == ["S1"]
+
+
+@pytest.mark.parametrize("queue_depth", [0, 1])
+def test_continue_on_error_records_failures(inputs, tmp_path, queue_depth):
+    good, bad = inputs
+    sink = MemorySink()
+    failures = process_samples(
+        [good, bad, good],
+        ["S1", "S2", "S3"],
+        ProcessingConfig(skip_keys=set()),
+        [sink],
+        continue_on_error=True,
+        read_queue=queue_depth,
+        write_queue=queue_depth,
+    )
+    assert list(sink.data) == ["S1", "S3"]
+    assert [f.sample for f in failures] == ["S2"]
+
+    report = tmp_path / "errors.tsv"
+    write_error_report(report, failures)
+    lines = report.read_text().splitlines()
+    assert lines[0] == "sample\tfile\terror"
+    assert lines[1].startswith(f"S2\t{bad}\tFailed to read JSON file")
+
+
+def test_resume_skips_completed_samples(inputs, tmp_path):
+    good, bad = inputs
+    checkpoint = Checkpoint(tmp_path / "checkpoint.jsonl")
+    config = ProcessingConfig(skip_keys=set())
+    process_samples(
+        [good, bad],
+        ["S1", "S2"],
+        config,
+        [],
+        checkpoint=checkpoint,
+        continue_on_error=True,
+    )
+    # Simulate a crash mid-write of the next entry
+    with checkpoint.path.open("a") as f:
+        f.write('{"sample": "S2", "res')
+    fingerprint = config_fingerprint(config)
+    assert list(checkpoint.load(fingerprint)) == ["S1"]
+
+    # S1's input is now unreadable; it must come from the checkpoint
+    good.write_text("{not json")
+    bad.write_text(json.dumps(SAMPLE))
+    sink = MemorySink()
+    failures = process_samples(
+        [good, bad], ["S1", "S2"], config, [sink], checkpoint=checkpoint, resume=True
+    )
+    assert failures == []
+    expected = {"smn1": {"region_depth": 44.0, "smn1_cn": 2}}
+    assert sink.data["S1"] == sink.data["S2"] == expected
+    assert list(checkpoint.load(fingerprint)) == ["S1", "S2"]
+
+
+def test_resume_keeps_checkpoint_if_rewrite_is_interrupted(
+    inputs, tmp_path, monkeypatch
+):
+    good, _ = inputs
+    checkpoint = Checkpoint(tmp_path / "checkpoint.jsonl")
+    config = ProcessingConfig(skip_keys=set())
+    process_samples([good], ["S1"], config, [], checkpoint=checkpoint)
+    before = checkpoint.path.read_text()
+
+    loads = []
+    load = Checkpoint.load
+    monkeypatch.setattr(
+        Checkpoint, "load", lambda self, f: loads.append(f) or load(self, f)
+    )
+
+    def preempted(src, dst):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr("paraphrase.checkpoint.os.replace", preempted)
+    with pytest.raises(KeyboardInterrupt):
+        process_samples([good], ["S1"], config, [], checkpoint=checkpoint, resume=True)
+    assert checkpoint.path.read_text() == before
+    assert len(loads) == 1
+
+
+def test_resume_refuses_other_settings_and_reprocesses_changed_inputs(inputs, tmp_path):
+    good, _ = inputs
+    checkpoint = Checkpoint(tmp_path / "checkpoint.jsonl")
+    config = ProcessingConfig(skip_keys=set())
+    process_samples([good], ["S1"], config, [], checkpoint=checkpoint)
+
+    other = ProcessingConfig(skip_keys=set(), genes_list=["cfh"])
+    with pytest.raises(CheckpointMismatchError):
+        process_samples([good], ["S1"], other, [], checkpoint=checkpoint, resume=True)
+
+    # Same sample name, different input file: processed again
+    moved = tmp_path / "moved.json"
+    moved.write_text(json.dumps({"f8": {"gene_cn": 1}}))
+    sink = MemorySink()
+    process_samples([moved], ["S1"], config, [sink], checkpoint=checkpoint, resume=True)
+    assert sink.data["S1"] == {"f8": {"gene_cn": 1}}
+
+
+def test_continue_on_error_skips_samples_with_malformed_fields(inputs, tmp_path):
+    good, _ = inputs
+    malformed = tmp_path / "malformed.json"
+    malformed.write_text(json.dumps({"smn1": {"region_depth": {"mean": 40}}}))
+    sink = MemorySink()
+    failures = process_samples(
+        [good, malformed],
+        ["S1", "S2"],
+        ProcessingConfig(skip_keys=set()),
+        [sink],
+        continue_on_error=True,
+    )
+    assert list(sink.data) == ["S1"]
+    assert [f.sample for f in failures] == ["S2"]
+    assert "region_depth" in failures[0].error
+
+
+def test_fields_are_handled_only_for_outputs_that_read_them(inputs, tmp_path):
+    good, _ = inputs
+    malformed = tmp_path / "malformed.json"
+    malformed.write_text(json.dumps({"smn1": {"region_depth": {"mean": 40}}}))
+    output = tmp_path / "status.tsv"
+    rules = {"smn1": {"rules": [{"status": "pathological", "when": {"smn1_cn": 0}}]}}
+    # Neither the rules nor the status output read region_depth
+    failures = process_samples(
+        [good, malformed],
+        ["S1", "S2"],
+        ProcessingConfig(skip_keys=set(), rules=rules),
+        [StatusSink(str(output))],
+    )
+    assert failures == []
+    rows = output.read_text().splitlines()[1:]
+    assert rows == ["S1\tsmn1\tnormal", "S2\tsmn1\tnormal"]
+
+
+def test_duplicate_sample_names_are_rejected(inputs):
+    good, bad = inputs
+    assert_equal_inputs_and_samples([good, bad], ["S1", "S2"])
+    with pytest.raises(InputMismatchError, match="duplicated: S1"):
+        assert_equal_inputs_and_samples([good, bad, good], ["S1", "S2", "S1"])
@@ -135,3 +135,88 @@ def test_handle_fusions_called():
         }
     }
     assert handle_fusions_called(input_data) == expected_output
+
+
+def test_gene_view_applies_handlers_lazily_and_memoizes():
+    from paraphrase.processors import GeneView
+
+    calls = []
+
+    def handle_region_depth(value):
+        calls.append(value)
+        return value["median"]
+
+    raw = {
+        "region_depth": {"median": 44.0},
+        "final_haplotypes": {"x1": "smn1_smn1hap1"},
+        "smn1_cn": None,
+        "smn2_cn": 3,
+    }
+    view = GeneView(raw, {"region_depth": handle_region_depth}, {"final_haplotypes"})
+
+    assert calls == []
+    assert view["region_depth"] == 44.0
+    assert view["region_depth"] == 44.0
+    assert len(calls) == 1
+
+    # Skipped keys and None values are hidden
+    assert "final_haplotypes" not in view
+    assert "smn1_cn" not in view
+    assert list(view) == ["region_depth", "smn2_cn"]
+
+    view["status"] = "normal"
+    assert dict(view) == {"region_depth": 44.0, "smn2_cn": 3, "status": "normal"}
+    assert raw["region_depth"] == {"median": 44.0}
+
+
+def test_handler_errors_are_not_mistaken_for_missing_fields():
+    import pytest
+
+    from paraphrase.config import ProcessingConfig
+    from paraphrase.exceptions import HandlerError
+    from paraphrase.processors import HANDLERS, GeneView, process_paraphase_json
+    from paraphrase.rules_engine import compile_rules
+
+    view = GeneView({"region_depth": {"mean": 5}}, HANDLERS, set())
+    assert "region_depth" in view
+    assert view.get("missing") is None
+    with pytest.raises(HandlerError):
+        view.get("region_depth")
+
+    rules = compile_rules(
+        {"smn1": {"rules": [{"status": "x", "when": {"region_depth": {"<": 10}}}]}}
+    )
+    config = ProcessingConfig(skip_keys=set(), rules=rules)
+    with pytest.raises(HandlerError):
+        process_paraphase_json({"smn1": {"region_depth": {"mean": 5}}}, config)
+    # Without rules, the malformed field fails only if every field is handled
+    sample = {"smn1": {"region_depth": {"mean": 5}, "smn1_cn": 2}}
+    processed = process_paraphase_json(sample, ProcessingConfig(skip_keys=set()))
+    assert processed["smn1"]["smn1_cn"] == 2
+    with pytest.raises(HandlerError):
+        process_paraphase_json(sample, ProcessingConfig(skip_keys=set()), True)
+
+
+def test_gene_record_shares_layout_and_serializes_like_a_dict():
+    import json
+
+    from paraphrase.io import json_default
+    from paraphrase.processors import GeneRecord, GeneView, freeze_sample
+
+    first = GeneView({"region_depth": {"median": 44.0}, "smn1_cn": 2}, {}, set())
+    first["status"] = "normal"
+    record_a = freeze_sample({"smn1": first})["smn1"]
+    record_b = GeneRecord.from_mapping(
+        {"region_depth": {"median": 40.0}, "smn1_cn": 0, "status": "pathological"}
+    )
+
+    assert record_a._layout is record_b._layout
+    assert not hasattr(record_a, "__dict__")
+    assert record_a == {
+        "region_depth": {"median": 44.0},
+        "smn1_cn": 2,
+        "status": "normal",
+    }
+    assert json.dumps({"smn1": record_b}, default=json_default) == json.dumps(
+        {"smn1": dict(record_b)}
+    )
@@ -0,0 +1,77 @@
+from paraphrase.config import ProcessingConfig
+from paraphrase.processors import GeneView, process_paraphase_json
+from paraphrase.profiling import RULE_STATS_HEADER, RuleProfiler
+from paraphrase.rules_engine import compile_rules, evaluate_gene_rules
+
+RULES = compile_rules(
+    {
+        "smn1": {
+            "rules": [
+                {"status": "pathological", "when": {"smn1_cn": 0, "smn2_cn": 1}},
+                {"status": "intermediate", "when": {"smn1_cn": 1}},
+            ]
+        },
+        "f8": {"rules": [{"status": "pathological", "when": {"cn": 9}}]},
+    }
+)
+
+
+def test_profiler_counts_evaluations_matches_and_leaves():
+    profiler = RuleProfiler(RULES)
+    for cn in (0, 1, 2):
+        evaluate_gene_rules(
+            "SMN1", {"smn1_cn": cn, "smn2_cn": 1}, RULES, profiler=profiler
+        )
+
+    pathological = profiler.stats[("smn1", 0)]
+    assert pathological.status == "pathological"
+    assert (pathological.evaluations, pathological.matches) == (3, 1)
+    # The AND short-circuits on smn1_cn for the two non-matching samples
+    assert pathological.leaf_evaluations == 4
+    assert profiler.stats[("smn1", 1)].matches == 1
+    # Seeded but never evaluated
+    assert profiler.stats[("f8", 0)].evaluations == 0
+
+
+def test_profiler_via_config_and_report(tmp_path):
+    profiler = RuleProfiler(RULES)
+    config = ProcessingConfig(skip_keys=set(), rules=RULES, profiler=profiler)
+    process_paraphase_json({"smn1": {"smn1_cn": 1}}, config)
+    assert profiler.stats[("smn1", 1)].matches == 1
+
+    other = RuleProfiler()
+    other.record("smn1", 1, True, 1, 0.5)
+    profiler.merge(other)
+    assert profiler.stats[("smn1", 1)].evaluations == 2
+
+    report = tmp_path / "rule_stats.tsv"
+    profiler.write_tsv(report)
+    lines = report.read_text().splitlines()
+    assert lines[0] == RULE_STATS_HEADER
+    # Most expensive rule first
+    assert lines[1].startswith("smn1\t1\tintermediate\t2\t2\t2\t")
+    assert len(lines) == 4
+
+
+def test_lazy_fields_are_computed_before_rules_are_timed():
+    handled = []
+
+    def handle(value):
+        handled.append(value)
+        return value
+
+    class CheckingProfiler(RuleProfiler):
+        def record(self, gene, rule_index, matched, leaves, seconds):
+            # Both handlers already ran before the first rule was timed
+            assert len(handled) == 2
+            super().record(gene, rule_index, matched, leaves, seconds)
+
+    info = GeneView(
+        {"smn1_cn": 1, "smn2_cn": 1},
+        {"smn1_cn": handle, "smn2_cn": handle},
+        set(),
+    )
+    profiler = CheckingProfiler(RULES)
+    status, _ = evaluate_gene_rules("SMN1", info, RULES, profiler=profiler)
+    assert status == "intermediate"
+    assert profiler.stats[("smn1", 0)].evaluations == 1
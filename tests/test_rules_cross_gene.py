@@ -0,0 +1,118 @@
+import pytest
+
+from paraphrase.config import ProcessingConfig
+from paraphrase.processors import process_paraphase_json
+from paraphrase.rules_engine import compile_rules, evaluation_order
+
+SAMPLE = {
+    "CFH": {"fusions_called": {"CFH_hap1": {"type": "duplication"}}},
+    "CFHR3": {"fusions_called": {"CFHR3_hap1": {"type": "deletion"}}},
+    "smn1": {"smn1_cn": 1, "smn2_cn": 3},
+    "smn2": {"smn2_cn": 3},
+}
+
+
+def _process(rules):
+    config = ProcessingConfig(skip_keys=set(), rules=compile_rules(rules))
+    return process_paraphase_json(SAMPLE, config)
+
+
+def test_rule_reads_other_gene_fields():
+    result = _process(
+        {
+            "cfh": {
+                "rules": [
+                    {
+                        "status": "pathological",
+                        "when": {
+                            "fusions_called.*.type": {"any": "duplication"},
+                            "@CFHR3.fusions_called.*.type": {"any": "deletion"},
+                        },
+                    }
+                ]
+            },
+            "smn2": {
+                "rules": [
+                    {
+                        "status": "intermediate",
+                        "when": {"smn2_cn": {">=": "@smn1.smn2_cn"}},
+                    }
+                ]
+            },
+        }
+    )
+    assert result["CFH"]["status"] == "pathological"
+    assert result["smn2"]["status"] == "intermediate"
+
+
+def test_missing_gene_never_matches():
+    result = _process(
+        {"smn1": {"rules": [{"status": "pathological", "when": {"@f8.cn": 1}}]}}
+    )
+    assert result["smn1"]["status"] == "normal"
+
+
+def test_status_dependencies_set_evaluation_order():
+    rules = compile_rules(
+        {
+            "smn2": {
+                "rules": [
+                    {"status": "intermediate", "when": {"@SMN1.status": "pathological"}}
+                ]
+            },
+            "smn1": {
+                "rules": [{"status": "pathological", "when": {"smn1_cn": {"<": 2}}}]
+            },
+        }
+    )
+    assert list(rules) == ["smn1", "smn2"]
+    assert evaluation_order(SAMPLE, rules) == ["smn1", "smn2"]
+
+    config = ProcessingConfig(skip_keys=set(), rules=rules)
+    result = process_paraphase_json(SAMPLE, config)
+    # Output keeps the input gene order
+    assert list(result) == list(SAMPLE)
+    assert result["smn2"]["status"] == "intermediate"
+
+
+def test_cyclic_status_references_are_rejected():
+    with pytest.raises(ValueError, match="smn1 -> smn2 -> smn1"):
+        compile_rules(
+            {
+                "smn1": {"rules": [{"status": "x", "when": {"@smn2.status": "x"}}]},
+                "smn2": {"rules": [{"status": "x", "when": {"@smn1.status": "x"}}]},
+            }
+        )
+
+
+def test_malformed_gene_path_is_rejected():
+    with pytest.raises(ValueError):
+        compile_rules({"smn1": {"rules": [{"status": "x", "when": {"@smn2": 1}}]}})
+
+
+def test_raw_rules_are_evaluated_in_dependency_order():
+    raw = {
+        "a": {
+            "rules": [{"status": "pathological", "when": {"@b.status": "intermediate"}}]
+        },
+        "b": {"rules": [{"status": "intermediate", "when": {"cn": 1}}]},
+    }
+    sample = {"a": {"cn": 0}, "b": {"cn": 1}}
+    for rules in (raw, compile_rules(raw)):
+        config = ProcessingConfig(skip_keys=set(), rules=rules)
+        assert process_paraphase_json(sample, config)["a"]["status"] == "pathological"
+
+
+def test_genes_filter_keeps_referenced_genes_for_evaluation():
+    rules = {
+        "smn1": {
+            "rules": [
+                {"status": "pathological", "when": {"smn1_cn": {"<": "@CFH.gene_cn"}}}
+            ]
+        }
+    }
+    sample = {"smn1": {"smn1_cn": 1}, "CFH": {"gene_cn": 2}, "f8": {"gene_cn": 1}}
+    config = ProcessingConfig(skip_keys=set(), genes_list=["smn1"], rules=rules)
+    result = process_paraphase_json(sample, config)
+    assert list(result) == ["smn1"]
+    assert result["smn1"]["status"] == "pathological"
@@ -1,4 +1,4 @@
-from paraphrase.rules_engine import evaluate_gene_rules, eval_when
+from paraphrase.rules_engine import compile_when, evaluate_gene_rules, eval_when
 
 
 def test_eval_when_map_means_and_across_keys():
@@ -9,6 +9,11 @@ def test_eval_when_map_means_and_across_keys():
     assert eval_when(gene_info, {"smn1_cn": 1, "smn2_cn": {">=": 4}}) is False
 
 
+def test_eval_when_empty_map_never_matches():
+    assert eval_when({"smn1_cn": 0}, {}) is False
+    assert compile_when({}).valid is False
+
+
 def test_evaluate_gene_rules_picks_most_severe_by_status_order_and_returns_matches():
     rules = {
         "smn1": {
@@ -0,0 +1,73 @@
+import pytest
+
+from paraphrase.rules_engine import compile_rules, eval_when, evaluate_gene_rules
+
+
+def test_in_and_not_in_are_frozen_at_compile_time():
+    rules = compile_rules(
+        {
+            "CFH": {
+                "rules": [
+                    {
+                        "status": "intermediate",
+                        "when": {"haplotype": {"in": ["CFH_hap1", "CFH_hap2"]}},
+                    }
+                ]
+            }
+        }
+    )
+    leaf = rules["CFH"].rules[0].condition.leaves[0]
+    assert leaf.expected == frozenset({"CFH_hap1", "CFH_hap2"})
+
+    assert evaluate_gene_rules("CFH", {"haplotype": "CFH_hap2"}, rules)[0] == (
+        "intermediate"
+    )
+    assert evaluate_gene_rules("CFH", {"haplotype": "CFH_hap3"}, rules)[0] == "normal"
+
+
+def test_in_with_unhashable_actual_value_does_not_match():
+    gene_info = {"fusions": ["a", "b"]}
+    assert eval_when(gene_info, {"fusions": {"in": ["a", "b"]}}) is False
+    assert eval_when(gene_info, {"fusions": {"not_in": ["a", "b"]}}) is True
+
+
+def test_matches_and_not_matches():
+    gene_info = {
+        "final_haplotypes": ["smn1_smn1hap1", "smn1_smn2hap2"],
+        "fusion": "CFH_hap1",
+    }
+    assert eval_when(gene_info, {"fusion": {"matches": "^CFH_hap[0-9]+$"}}) is True
+    assert eval_when(gene_info, {"final_haplotypes": {"matches": "smn2hap"}}) is True
+    assert (
+        eval_when(gene_info, {"final_haplotypes": {"not_matches": "smn1_del78"}})
+        is True
+    )
+    assert eval_when(gene_info, {"missing": {"matches": ".*"}}) is False
+
+
+def test_between_is_inclusive():
+    assert eval_when({"region_depth": 20}, {"region_depth": {"between": [20, 60]}})
+    assert eval_when({"region_depth": 60.0}, {"region_depth": {"between": [20, 60]}})
+    assert not eval_when({"region_depth": 61}, {"region_depth": {"between": [20, 60]}})
+
+
+def test_invalid_operator_values_fail_at_compile_time():
+    with pytest.raises(ValueError):
+        compile_rules(
+            {"smn1": {"rules": [{"status": "x", "when": {"a": {"between": 1}}}]}}
+        )
+    with pytest.raises(ValueError):
+        compile_rules(
+            {"smn1": {"rules": [{"status": "x", "when": {"a": {"matches": "("}}}]}}
+        )
+    with pytest.raises(ValueError):
+        compile_rules({"smn1": {"rules": [{"status": "x", "when": {"a": {"~": 1}}}]}})
+    # Strings are not field references for these operators
+    with pytest.raises(ValueError):
+        compile_rules(
+            {"smn1": {"rules": [{"status": "x", "when": {"a": {"between": "low"}}}]}}
+        )
+    with pytest.raises(ValueError):
+        compile_rules(
+            {"smn1": {"rules": [{"status": "x", "when": {"a": {"matches": ["a"]}}}]}}
+        )
@@ -0,0 +1,60 @@
+from paraphrase.rules_engine import FieldPath, eval_when, evaluate_gene_rules
+
+GENE_INFO = {
+    "fusions_called": {
+        "CFH_hap1": {"type": "deletion", "breakpoint": [[1, 2], [3, 4]]},
+        "CFH_hap2": {"type": "duplication"},
+        "CFH_hap3": {"breakpoint": [[5, 6]]},
+    },
+    "final_haplotypes": ["smn1_smn1hap1", "smn1_smn2hap2"],
+}
+
+
+def test_wildcard_path_resolves_all_children():
+    path = FieldPath.parse("fusions_called.*.type")
+    assert path.wildcard is True
+    assert path.resolve(GENE_INFO) == ["deletion", "duplication"]
+
+
+def test_wildcard_defaults_to_any():
+    assert eval_when(GENE_INFO, {"fusions_called.*.type": "deletion"}) is True
+    assert eval_when(GENE_INFO, {"fusions_called.*.type": "inversion"}) is False
+
+
+def test_any_all_and_count_quantifiers():
+    assert eval_when(
+        GENE_INFO, {"fusions_called.*.type": {"any": {"in": ["deletion"]}}}
+    )
+    assert not eval_when(GENE_INFO, {"fusions_called.*.type": {"all": "deletion"}})
+    assert eval_when(GENE_INFO, {"fusions_called.*.type": {"all": {"matches": "ion$"}}})
+    assert eval_when(GENE_INFO, {"fusions_called.*": {"count": 3}})
+    assert eval_when(GENE_INFO, {"fusions_called.*.breakpoint": {"count": {">=": 2}}})
+    # Quantifiers also apply to plain list values
+    assert eval_when(GENE_INFO, {"final_haplotypes": {"any": {"matches": "smn2"}}})
+
+
+def test_all_is_false_when_there_are_no_values():
+    assert not eval_when(
+        {"fusions_called": {}}, {"fusions_called.*.type": {"all": "deletion"}}
+    )
+    assert eval_when({"fusions_called": {}}, {"fusions_called.*": {"count": 0}})
+
+
+def test_rules_share_one_traversal_per_gene():
+    rules = {
+        "CFH": {
+            "rules": [
+                {
+                    "status": "intermediate",
+                    "when": {"fusions_called.*.type": "duplication"},
+                },
+                {
+                    "status": "pathological",
+                    "when": {"fusions_called.*.type": "deletion"},
+                },
+            ]
+        }
+    }
+    status, matches = evaluate_gene_rules("CFH", GENE_INFO, rules)
+    assert status == "pathological"
+    assert [m.rule_index for m in matches] == [0, 1]
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from paraphrase.io import TSV_HEADER, expand_compact
+from paraphrase.sinks import JSONSink, parse_sink_spec
+
+SAMPLES = {
+    "S1": {"smn1": {"region_depth": 44.0, "final_haplotypes": ["a", "b"]}},
+    "S2": {"CFH": {"region_depth": 41.0, "status": "normal"}},
+}
+
+
+def _write_all(sink):
+    sink.open()
+    for sample, data in SAMPLES.items():
+        sink.write_sample(sample, data)
+    sink.close()
+
+
+def test_json_sink_matches_indented_dump(tmp_path):
+    path = tmp_path / "out.json"
+    _write_all(JSONSink(str(path)))
+    assert path.read_text() == json.dumps(SAMPLES, indent=2) + "\n"
+
+
+def test_json_sink_without_samples_writes_empty_object(tmp_path):
+    path = tmp_path / "out.json"
+    sink = JSONSink(str(path))
+    sink.open()
+    sink.close()
+    assert json.loads(path.read_text()) == {}
+
+
+def test_all_sinks_receive_the_same_samples(tmp_path):
+    sinks = [
+        parse_sink_spec(f"compact:{tmp_path / 'out.compact.json'}"),
+        parse_sink_spec(f"tsv:{tmp_path / 'out.tsv'}"),
+        parse_sink_spec(f"summary:{tmp_path / 'summary.json'}"),
+    ]
+    for sink in sinks:
+        _write_all(sink)
+
+    compact = json.loads((tmp_path / "out.compact.json").read_text())
+    assert expand_compact(compact) == SAMPLES
+
+    rows = (tmp_path / "out.tsv").read_text().splitlines()
+    assert rows[0] == TSV_HEADER
+    assert "S2\tCFH\tnormal\tregion_depth\t41.0" in rows
+
+    summary = json.loads((tmp_path / "summary.json").read_text())
+    assert summary["samples"] == 2
+
+
+def test_unknown_sink_format_is_rejected():
+    with pytest.raises(ValueError):
+        parse_sink_spec("xml:out.xml")
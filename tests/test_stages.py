@@ -0,0 +1,62 @@
+import threading
+from contextlib import closing
+
+import pytest
+
+from paraphrase.stages import BackgroundWriter, read_ahead
+
+
+@pytest.mark.parametrize("depth", [0, 1, 4])
+def test_read_ahead_preserves_order(depth):
+    assert list(read_ahead(iter(range(20)), depth)) == list(range(20))
+
+
+def test_read_ahead_reraises_in_consumer():
+    def items():
+        yield 1
+        raise OSError("disk gone")
+
+    reads = read_ahead(items(), 2)
+    assert next(reads) == 1
+    with pytest.raises(OSError, match="disk gone"):
+        next(reads)
+
+
+def test_read_ahead_is_bounded_and_stops_on_close():
+    produced = []
+
+    def items():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    with closing(read_ahead(items(), 2)) as reads:
+        assert next(reads) == 0
+    # One consumed, at most `depth` queued and one blocked on the full queue
+    assert len(produced) <= 4
+
+
+def test_background_writer_writes_in_order_on_another_thread():
+    written, threads = [], set()
+
+    def write(item):
+        threads.add(threading.current_thread().name)
+        written.append(item)
+
+    writer = BackgroundWriter(write, 2)
+    for i in range(10):
+        writer.submit(i)
+    writer.close()
+    assert written == list(range(10))
+    assert threads == {"paraphrase-writer"}
+
+
+def test_background_writer_reraises_write_errors():
+    def write(item):
+        raise ValueError(f"cannot write {item}")
+
+    writer = BackgroundWriter(write, 2)
+    with pytest.raises(ValueError, match="cannot write 0"):
+        for i in range(10):
+            writer.submit(i)
+        writer.close()
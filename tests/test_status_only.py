@@ -0,0 +1,84 @@
+import json
+
+from paraphrase.config import ProcessingConfig
+from paraphrase.io import parse_json
+from paraphrase.pipeline import process_samples
+from paraphrase.processors import process_gene_info
+from paraphrase.rules_engine import compile_rules, rules_projection
+from paraphrase.sinks import MemorySink, StatusSink
+
+RULES = compile_rules(
+    {
+        "smn1": {
+            "rules": [
+                {"status": "pathological", "when": {"smn1_cn": {"<": "smn2_cn"}}},
+                {
+                    "status": "intermediate",
+                    "when": {"@CFHR3.fusions_called": {"not_empty": True}},
+                },
+            ]
+        },
+        "CFH": {
+            "rules": [{"status": "intermediate", "when": {"*.*.type": "deletion"}}]
+        },
+    }
+)
+SAMPLE = {
+    "SMN1": {
+        "smn1_cn": 1,
+        "smn2_cn": 3,
+        "region_depth": {"median": 40.0},
+        "final_haplotypes": {"h1": "x"},
+    },
+    "CFH": {"fusions_called": {"f1": {"type": "deletion"}}, "gene_cn": 2},
+    "CFHR3": {"fusions_called": None, "gene_cn": 2},
+    "f8": {"gene_cn": 1},
+}
+
+
+def test_rules_projection_lists_fields_read_per_gene():
+    assert rules_projection(RULES) == {
+        "smn1": {"smn1_cn", "smn2_cn"},
+        "cfhr3": {"fusions_called"},
+        # A leading wildcard reads every field
+        "cfh": None,
+    }
+
+
+def test_projection_is_applied_when_parsing():
+    projection = rules_projection(RULES)
+    data = parse_json(json.dumps(SAMPLE).encode(), "sample.json", projection)
+    assert data == {
+        "SMN1": {"smn1_cn": 1, "smn2_cn": 3},
+        "CFH": SAMPLE["CFH"],
+        "CFHR3": {"fusions_called": None},
+    }
+
+
+def test_process_gene_info_keeps_only_projected_fields():
+    assert process_gene_info(SAMPLE["SMN1"], {}, set(), {"smn1_cn"}) == {"smn1_cn": 1}
+
+
+def test_status_only_matches_full_classification(tmp_path):
+    file = tmp_path / "sample.json"
+    file.write_text(json.dumps(SAMPLE))
+
+    full, projected = MemorySink(), MemorySink()
+    config = ProcessingConfig(skip_keys=set(), rules=RULES)
+    process_samples([file], ["S1"], config, [full])
+    config.projection = rules_projection(RULES)
+    status_file = tmp_path / "status.tsv"
+    process_samples([file], ["S1"], config, [projected, StatusSink(str(status_file))])
+
+    def statuses(data):
+        return {gene: info.get("status") for gene, info in data["S1"].items()}
+
+    assert statuses(projected.data) == {
+        gene: status for gene, status in statuses(full.data).items() if gene != "f8"
+    }
+    assert "region_depth" not in projected.data["S1"]["SMN1"]
+    assert status_file.read_text().splitlines() == [
+        "sample\tgene\tstatus",
+        "S1\tSMN1\tpathological",
+        "S1\tCFH\tintermediate",
+    ]
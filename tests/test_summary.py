@@ -0,0 +1,60 @@
+from paraphrase.summary import CohortSummary, QuantileSketch, merge_summaries
+
+
+def test_quantile_sketch_is_within_relative_accuracy():
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in range(1, 1001):
+        sketch.add(float(value))
+
+    assert sketch.count == 1000
+    assert sketch.min == 1.0
+    assert sketch.max == 1000.0
+    assert abs(sketch.quantile(0.5) - 500.0) <= 500.0 * 0.02
+    assert abs(sketch.quantile(0.95) - 950.0) <= 950.0 * 0.02
+
+
+def test_quantile_sketch_merge_matches_single_sketch():
+    single = QuantileSketch()
+    left = QuantileSketch()
+    right = QuantileSketch()
+    for value in range(1, 201):
+        single.add(value)
+        (left if value % 2 else right).add(value)
+
+    left.merge(right)
+    assert left.count == single.count
+    for q in (0.1, 0.5, 0.9):
+        assert left.quantile(q) == single.quantile(q)
+
+
+def test_cohort_summary_counts_statuses_and_copy_numbers():
+    summary = CohortSummary()
+    summary.add_sample(
+        {"smn1": {"status": "pathological", "smn1_cn": 0, "region_depth": 40.0}}
+    )
+    summary.add_sample({"smn1": {"status": "normal", "smn1_cn": 2.0}})
+    summary.add_sample({"smn1": {"smn1_cn": 2, "region_depth": 44.0}})
+
+    gene = summary.to_dict()["genes"]["smn1"]
+    assert summary.samples == 3
+    assert gene["status_counts"] == {"normal": 1, "pathological": 1, "unknown": 1}
+    assert gene["copy_numbers"] == {"smn1_cn": {"0": 1, "2": 2}}
+    assert gene["region_depth"]["count"] == 2
+    assert gene["region_depth"]["min"] == 40.0
+
+
+def test_merge_summaries_combines_shards():
+    shard_a = CohortSummary()
+    shard_a.add_sample({"CFH": {"status": "normal", "gene_cn": 2}})
+    shard_b = CohortSummary()
+    shard_b.add_sample({"CFH": {"status": "intermediate", "gene_cn": 2}})
+    shard_b.add_sample({"CFHR3": {"gene_cn": 1}})
+
+    merged = merge_summaries([shard_a.to_dict(), shard_b.to_dict()])
+    assert merged["samples"] == 3
+    assert merged["genes"]["CFH"]["copy_numbers"]["gene_cn"] == {"2": 2}
+    assert merged["genes"]["CFH"]["status_counts"] == {
+        "intermediate": 1,
+        "normal": 1,
+    }
+    assert merged["genes"]["CFHR3"]["samples"] == 1